@@ -6,68 +6,131 @@ Handles all database operations with prepared statements
 import sqlite3
 import os
 import uuid
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple, Any
+from typing import List, Dict, Optional, Tuple, Any, Iterator
 from pathlib import Path
 import math
+from bisect import bisect_left
 
 DB_PATH = Path(__file__).parent.parent / "data" / "finance.db"
 SCHEMA_PATH = Path(__file__).parent / "schema.sql"
 
+# Applied to every new connection (these settings are per-connection).
+# Each threadpool thread holds its own connection, so cache_size is kept
+# modest (8 MiB); mmap pages are shared through the OS page cache.
+CONNECTION_PRAGMAS = """
+PRAGMA foreign_keys = ON;
+PRAGMA synchronous = NORMAL;
+PRAGMA temp_store = MEMORY;
+PRAGMA mmap_size = 268435456;
+PRAGMA cache_size = -8192;
+PRAGMA busy_timeout = 5000;
+"""
+
 
 class DatabaseManager:
-    """Manages SQLite database operations with connection pooling"""
+    """Manages SQLite database operations with one connection per thread"""
     
     def __init__(self, db_path: str = None):
         self.db_path = db_path or str(DB_PATH)
+        # Sorted category names and (lowercase, name) pairs for autocomplete,
+        # reloaded lazily after a category insert
+        self._category_names: Optional[List[str]] = None
+        self._category_index: Optional[List[Tuple[str, str]]] = None
+        self._category_lock = threading.Lock()
+        # Per-thread long-lived connection (and whether it is inside a
+        # transaction() block); reusing it keeps its statement cache warm
+        self._local = threading.local()
         self._ensure_db_exists()
     
     def _ensure_db_exists(self):
         """Create database and schema if not exists"""
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
         
-        if not os.path.exists(self.db_path):
-            conn = sqlite3.connect(self.db_path)
-            with open(SCHEMA_PATH, 'r') as f:
-                conn.executescript(f.read())
-            conn.commit()
-            conn.close()
+        # Schema is idempotent (IF NOT EXISTS), so apply it to existing
+        # databases too - this picks up indexes added after creation
+        conn = sqlite3.connect(self.db_path)
+        with open(SCHEMA_PATH, 'r') as f:
+            conn.executescript(f.read())
+        conn.commit()
+        # WAL lets readers proceed during a write and is persistent in the
+        # database file, so it only needs to be set once
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.close()
     
     def get_connection(self) -> sqlite3.Connection:
-        """Get a database connection"""
-        conn = sqlite3.connect(self.db_path)
+        """Get a new database connection"""
+        # check_same_thread is off so a streaming cursor may be resumed from
+        # another threadpool thread; connections are never used concurrently
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=256)
         conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA foreign_keys = ON")
+        conn.executescript(CONNECTION_PRAGMAS)
         return conn
     
-    def execute(self, query: str, params: tuple = ()) -> sqlite3.Cursor:
-        """Execute a query with parameters"""
-        conn = self.get_connection()
+    def _conn(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self.get_connection()
+            self._local.conn = conn
+        return conn
+    
+    def _in_transaction(self) -> bool:
+        return getattr(self._local, 'in_transaction', False)
+    
+    @contextmanager
+    def transaction(self):
+        """Group all statements in the block into one BEGIN IMMEDIATE/COMMIT.
+        
+        execute/fetch_one/fetch_all on this thread run inside the block;
+        nested blocks join the outermost transaction.
+        """
+        conn = self._conn()
+        if self._in_transaction():
+            yield conn
+            return
+        
+        conn.execute("BEGIN IMMEDIATE")
+        self._local.in_transaction = True
         try:
-            cursor = conn.execute(query, params)
+            yield conn
             conn.commit()
-            return cursor
+        except BaseException:
+            conn.rollback()
+            raise
         finally:
-            conn.close()
+            self._local.in_transaction = False
+            # Categories inserted in this block only become visible to other
+            # connections now, so drop anything cached in the meantime
+            if getattr(self._local, 'categories_dirty', False):
+                self._local.categories_dirty = False
+                self._invalidate_categories()
+    
+    def execute(self, query: str, params: tuple = ()) -> sqlite3.Cursor:
+        """Execute a query with parameters"""
+        if self._in_transaction():
+            return self._conn().execute(query, params)
+        # Run standalone writes in their own transaction so a failing
+        # statement is rolled back instead of leaving an implicit BEGIN open
+        # (and the write lock held) on this thread's long-lived connection
+        with self.transaction() as conn:
+            return conn.execute(query, params)
+    
+    def execute_many(self, query: str, seq_of_params: List[tuple]) -> sqlite3.Cursor:
+        """Execute a query once per parameter tuple in a single commit"""
+        with self.transaction() as conn:
+            return conn.executemany(query, seq_of_params)
     
     def fetch_one(self, query: str, params: tuple = ()) -> Optional[Dict]:
         """Fetch single row"""
-        conn = self.get_connection()
-        try:
-            cursor = conn.execute(query, params)
-            row = cursor.fetchone()
-            return dict(row) if row else None
-        finally:
-            conn.close()
+        row = self._conn().execute(query, params).fetchone()
+        return dict(row) if row else None
     
     def fetch_all(self, query: str, params: tuple = ()) -> List[Dict]:
         """Fetch all rows"""
-        conn = self.get_connection()
-        try:
-            cursor = conn.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
-        finally:
-            conn.close()
+        return [dict(row) for row in self._conn().execute(query, params).fetchall()]
     
     # ==================== CATEGORY OPERATIONS ====================
     
@@ -79,65 +142,102 @@ class DatabaseManager:
         if existing:
             return existing['id']
         
+        # Another thread may create the same name between the SELECT and the
+        # INSERT, so ignore the duplicate and re-read the winning id
         cat_id = f"cat_{uuid.uuid4().hex[:8]}"
-        self.execute(
-            "INSERT INTO categories (id, name, type) VALUES (?, ?, ?)",
+        cursor = self.execute(
+            """INSERT INTO categories (id, name, type) VALUES (?, ?, ?)
+               ON CONFLICT(name) DO NOTHING""",
             (cat_id, name, cat_type)
         )
+        if cursor.rowcount == 0:
+            return self.fetch_one(
+                "SELECT id FROM categories WHERE name = ?", (name,)
+            )['id']
+        if self._in_transaction():
+            self._local.categories_dirty = True
+        self._invalidate_categories()
         return cat_id
     
+    def _invalidate_categories(self):
+        """Drop the in-memory category arrays"""
+        with self._category_lock:
+            self._category_names = None
+            self._category_index = None
+    
+    def _load_categories(self) -> Tuple[List[str], List[Tuple[str, str]]]:
+        """Load category names into the in-memory sorted arrays and return them"""
+        with self._category_lock:
+            rows = self.fetch_all("SELECT name FROM categories ORDER BY name")
+            names = [row['name'] for row in rows]
+            index = sorted((name.lower(), name) for name in names)
+            self._category_names = names
+            self._category_index = index
+        # Callers use these rather than re-reading the attributes, which a
+        # concurrent invalidation may already have reset to None
+        return names, index
+    
     def get_all_categories(self) -> List[str]:
         """Get all category names"""
-        rows = self.fetch_all("SELECT name FROM categories ORDER BY name")
-        return [row['name'] for row in rows]
+        names = self._category_names
+        if names is None:
+            names, _ = self._load_categories()
+        return list(names)
     
     def get_categories_by_prefix(self, prefix: str, limit: int = 10) -> List[str]:
-        """Get categories matching prefix (Trie-like behavior via SQL)"""
-        rows = self.fetch_all(
-            "SELECT name FROM categories WHERE LOWER(name) LIKE LOWER(?) || '%' LIMIT ?",
-            (prefix, limit)
-        )
-        return [row['name'] for row in rows]
+        """Get categories matching prefix (Trie-like behavior via binary search)"""
+        index = self._category_index
+        if index is None:
+            _, index = self._load_categories()
+        key = prefix.lower()
+        result = []
+        for i in range(bisect_left(index, (key, '')), len(index)):
+            lowered, name = index[i]
+            if not lowered.startswith(key) or len(result) >= limit:
+                break
+            result.append(name)
+        return result
     
     # ==================== TRANSACTION OPERATIONS ====================
     
     def add_transaction(self, tx_type: str, amount: float, category: str, 
                         description: str = '', date: str = None) -> Tuple[Dict, Optional[Dict]]:
         """Add a new transaction and return anomaly info"""
-        tx_id = f"txn_{uuid.uuid4().hex[:12]}"
-        date = date or datetime.now().strftime('%Y-%m-%d')
-        cat_id = self.get_or_create_category(category)
-        
-        # Detect anomaly BEFORE updating stats (for expenses)
-        anomaly_info = None
-        is_anomaly = 0
-        z_score = 0.0
-        if tx_type == 'expense':
-            anomaly_info = self._detect_anomaly_internal(cat_id, category, amount)
-            is_anomaly = 1 if anomaly_info.get('isAnomaly', False) else 0
-            z_score = anomaly_info.get('zScore', 0.0)
-        
-        # Insert transaction with anomaly info
-        self.execute(
-            """INSERT INTO transactions (id, type, amount, category_id, description, date, is_anomaly, z_score)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-            (tx_id, tx_type, amount, cat_id, description, date, is_anomaly, z_score)
-        )
-        
-        # Update daily spending aggregates
-        self._update_daily_spending(date, tx_type, amount, 1)
-        
-        # Update spending stats for anomaly detection AFTER checking for anomaly
-        if tx_type == 'expense':
-            self._update_spending_stats(cat_id, amount)
-        
-        # Record undo action
-        self._push_undo(0, f"{tx_id}|{tx_type}|{amount}|{category}|{description}|{date}")
-        
-        return {
-            'id': tx_id, 'type': tx_type, 'amount': amount,
-            'category': category, 'description': description, 'date': date
-        }, anomaly_info
+        with self.transaction():
+            tx_id = f"txn_{uuid.uuid4().hex[:12]}"
+            date = date or datetime.now().strftime('%Y-%m-%d')
+            cat_id = self.get_or_create_category(category)
+
+            # Detect anomaly BEFORE updating stats (for expenses)
+            anomaly_info = None
+            is_anomaly = 0
+            z_score = 0.0
+            if tx_type == 'expense':
+                anomaly_info = self._detect_anomaly_internal(cat_id, category, amount)
+                is_anomaly = 1 if anomaly_info.get('isAnomaly', False) else 0
+                z_score = anomaly_info.get('zScore', 0.0)
+
+            # Insert transaction with anomaly info
+            self.execute(
+                """INSERT INTO transactions (id, type, amount, category_id, description, date, is_anomaly, z_score)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                (tx_id, tx_type, amount, cat_id, description, date, is_anomaly, z_score)
+            )
+
+            # Update daily spending aggregates
+            self._update_daily_spending(date, tx_type, amount, 1)
+
+            # Update spending stats for anomaly detection AFTER checking for anomaly
+            if tx_type == 'expense':
+                self._update_spending_stats(cat_id, amount)
+
+            # Record undo action
+            self._push_undo(0, f"{tx_id}|{tx_type}|{amount}|{category}|{description}|{date}")
+
+            return {
+                'id': tx_id, 'type': tx_type, 'amount': amount,
+                'category': category, 'description': description, 'date': date
+            }, anomaly_info
     
     def get_transaction_by_id(self, tx_id: str) -> Optional[Dict]:
         """Get transaction by ID (Skip List simulation via indexed lookup)"""
@@ -161,15 +261,31 @@ class DatabaseManager:
             (start_date, end_date)
         )
     
-    def get_all_transactions(self, order: str = 'desc') -> List[Dict]:
-        """Get all transactions ordered by date"""
+    @staticmethod
+    def _all_transactions_query(order: str) -> str:
+        """SQL for all transactions ordered by date"""
         order_clause = 'DESC' if order == 'desc' else 'ASC'
-        return self.fetch_all(
-            f"""SELECT t.id, t.type, t.amount, c.name as category, t.description, t.date
+        return f"""SELECT t.id, t.type, t.amount, c.name as category, t.description, t.date
                 FROM transactions t
                 JOIN categories c ON t.category_id = c.id
                 ORDER BY t.date {order_clause}, t.created_at {order_clause}"""
-        )
+    
+    def get_all_transactions(self, order: str = 'desc') -> List[Dict]:
+        """Get all transactions ordered by date"""
+        return self.fetch_all(self._all_transactions_query(order))
+    
+    def iter_all_transactions(self, order: str = 'desc', batch_size: int = 1000) -> Iterator[List[Dict]]:
+        """Yield all transactions ordered by date in batches (for streaming)"""
+        conn = self.get_connection()
+        try:
+            cursor = conn.execute(self._all_transactions_query(order))
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield [dict(row) for row in rows]
+        finally:
+            conn.close()
     
     def get_recent_transactions(self, count: int = 10) -> List[Dict]:
         """Get most recent transactions"""
@@ -184,53 +300,55 @@ class DatabaseManager:
     
     def delete_transaction(self, tx_id: str) -> bool:
         """Delete a transaction by ID"""
-        tx = self.get_transaction_by_id(tx_id)
-        if not tx:
-            return False
-        
-        # Record for undo
-        self._push_undo(1, f"{tx['id']}|{tx['type']}|{tx['amount']}|{tx['category']}|{tx['description']}|{tx['date']}")
-        
-        # IMPORTANT: Delete transaction FIRST before updating stats
-        # This ensures _remove_from_spending_stats calculates correctly without the deleted transaction
-        self.execute("DELETE FROM transactions WHERE id = ?", (tx_id,))
-        
-        # Update daily spending
-        self._update_daily_spending(tx['date'], tx['type'], -tx['amount'], -1)
-        
-        # Update spending stats for anomaly detection (for expenses)
-        if tx['type'] == 'expense':
-            self._remove_from_spending_stats(tx['category'], tx['amount'])
-        
-        return True
+        with self.transaction():
+            tx = self.get_transaction_by_id(tx_id)
+            if not tx:
+                return False
+
+            # Record for undo
+            self._push_undo(1, f"{tx['id']}|{tx['type']}|{tx['amount']}|{tx['category']}|{tx['description']}|{tx['date']}")
+
+            # IMPORTANT: Delete transaction FIRST before updating stats
+            # This ensures _remove_from_spending_stats calculates correctly without the deleted transaction
+            self.execute("DELETE FROM transactions WHERE id = ?", (tx_id,))
+
+            # Update daily spending
+            self._update_daily_spending(tx['date'], tx['type'], -tx['amount'], -1)
+
+            # Update spending stats for anomaly detection (for expenses)
+            if tx['type'] == 'expense':
+                self._remove_from_spending_stats(tx['category'], tx['amount'])
+
+            return True
     
     # ==================== BUDGET OPERATIONS ====================
     
     def set_budget(self, category: str, limit: float) -> Dict:
         """Set or update budget for a category"""
-        cat_id = self.get_or_create_category(category)
-        budget_id = f"budget_{uuid.uuid4().hex[:8]}"
-        
-        existing = self.fetch_one(
-            "SELECT id, budget_limit FROM budgets WHERE category_id = ?", (cat_id,)
-        )
-        
-        if existing:
-            # Record old value for undo
-            self._push_undo(3, f"{category}|{existing['budget_limit']}")
-            self.execute(
-                "UPDATE budgets SET budget_limit = ?, updated_at = CURRENT_TIMESTAMP WHERE category_id = ?",
-                (limit, cat_id)
-            )
-            budget_id = existing['id']
-        else:
-            self._push_undo(2, f"{category}|{limit}")
-            self.execute(
-                "INSERT INTO budgets (id, category_id, budget_limit) VALUES (?, ?, ?)",
-                (budget_id, cat_id, limit)
+        with self.transaction():
+            cat_id = self.get_or_create_category(category)
+            budget_id = f"budget_{uuid.uuid4().hex[:8]}"
+
+            existing = self.fetch_one(
+                "SELECT id, budget_limit FROM budgets WHERE category_id = ?", (cat_id,)
             )
-        
-        return self.get_budget(category)
+
+            if existing:
+                # Record old value for undo
+                self._push_undo(3, f"{category}|{existing['budget_limit']}")
+                self.execute(
+                    "UPDATE budgets SET budget_limit = ?, updated_at = CURRENT_TIMESTAMP WHERE category_id = ?",
+                    (limit, cat_id)
+                )
+                budget_id = existing['id']
+            else:
+                self._push_undo(2, f"{category}|{limit}")
+                self.execute(
+                    "INSERT INTO budgets (id, category_id, budget_limit) VALUES (?, ?, ?)",
+                    (budget_id, cat_id, limit)
+                )
+
+            return self.get_budget(category)
     
     def get_budget(self, category: str) -> Optional[Dict]:
         """Get budget status for a category"""
@@ -307,21 +425,22 @@ class DatabaseManager:
     
     def add_bill(self, name: str, amount: float, due_date: str, category: str) -> Dict:
         """Add a bill to the queue"""
-        bill_id = f"bill_{uuid.uuid4().hex[:8]}"
-        cat_id = self.get_or_create_category(category)
-        
-        self.execute(
-            """INSERT INTO bills (id, name, amount, due_date, category_id)
-               VALUES (?, ?, ?, ?, ?)""",
-            (bill_id, name, amount, due_date, cat_id)
-        )
-        
-        self._push_undo(4, f"{bill_id}|{name}|{amount}|{due_date}|{category}")
-        
-        return {
-            'id': bill_id, 'name': name, 'amount': amount,
-            'dueDate': due_date, 'category': category, 'isPaid': False
-        }
+        with self.transaction():
+            bill_id = f"bill_{uuid.uuid4().hex[:8]}"
+            cat_id = self.get_or_create_category(category)
+
+            self.execute(
+                """INSERT INTO bills (id, name, amount, due_date, category_id)
+                   VALUES (?, ?, ?, ?, ?)""",
+                (bill_id, name, amount, due_date, cat_id)
+            )
+
+            self._push_undo(4, f"{bill_id}|{name}|{amount}|{due_date}|{category}")
+
+            return {
+                'id': bill_id, 'name': name, 'amount': amount,
+                'dueDate': due_date, 'category': category, 'isPaid': False
+            }
     
     def get_all_bills(self) -> List[Dict]:
         """Get all bills (FIFO order by creation)"""
@@ -336,25 +455,29 @@ class DatabaseManager:
     
     def pay_bill(self, bill_id: str) -> bool:
         """Mark a bill as paid"""
-        self._push_undo(6, bill_id)
-        result = self.execute(
-            "UPDATE bills SET is_paid = 1, paid_at = CURRENT_TIMESTAMP WHERE id = ?",
-            (bill_id,)
-        )
-        return result.rowcount > 0
+        with self.transaction():
+            result = self.execute(
+                "UPDATE bills SET is_paid = 1, paid_at = CURRENT_TIMESTAMP WHERE id = ?",
+                (bill_id,)
+            )
+            if result.rowcount == 0:
+                return False
+            self._push_undo(6, bill_id)
+            return True
     
     def delete_bill(self, bill_id: str) -> bool:
         """Delete a bill"""
-        bill = self.fetch_one(
-            """SELECT b.*, c.name as category FROM bills b 
-               JOIN categories c ON b.category_id = c.id WHERE b.id = ?""",
-            (bill_id,)
-        )
-        if bill:
-            self._push_undo(5, f"{bill['id']}|{bill['name']}|{bill['amount']}|{bill['due_date']}|{bill['category']}")
-            self.execute("DELETE FROM bills WHERE id = ?", (bill_id,))
-            return True
-        return False
+        with self.transaction():
+            bill = self.fetch_one(
+                """SELECT b.*, c.name as category FROM bills b 
+                   JOIN categories c ON b.category_id = c.id WHERE b.id = ?""",
+                (bill_id,)
+            )
+            if bill:
+                self._push_undo(5, f"{bill['id']}|{bill['name']}|{bill['amount']}|{bill['due_date']}|{bill['category']}")
+                self.execute("DELETE FROM bills WHERE id = ?", (bill_id,))
+                return True
+            return False
     
     # ==================== ANALYTICS ====================
     
@@ -460,10 +583,13 @@ class DatabaseManager:
     
     def get_spending_trend(self, days: int = 7) -> Dict:
         """Get spending trend using sliding window concept"""
-        end_date = datetime.now().strftime('%Y-%m-%d')
-        start_date = (datetime.now() - timedelta(days=days-1)).strftime('%Y-%m-%d')
+        # Read the clock once so all window boundaries agree
+        now = datetime.now()
+        end_date = now.strftime('%Y-%m-%d')
+        start_date = (now - timedelta(days=days-1)).strftime('%Y-%m-%d')
+        mid_date = (now - timedelta(days=days//2)).strftime('%Y-%m-%d')
         
-        # Get daily data directly from transactions (more reliable than aggregates)
+        # Single grouped range query over the date index (one round trip)
         daily_data = self.fetch_all(
             """SELECT date,
                       SUM(CASE WHEN type = 'income' THEN amount ELSE 0 END) as total_income,
@@ -476,9 +602,18 @@ class DatabaseManager:
             (start_date, end_date)
         )
         
-        # Calculate totals and moving average
-        total_expenses = sum(d['total_expenses'] for d in daily_data)
-        total_income = sum(d['total_income'] for d in daily_data)
+        # Calculate totals and both window halves in a single pass
+        total_expenses = 0
+        total_income = 0
+        first_half_expenses = 0.0
+        second_half_expenses = 0.0
+        for d in daily_data:
+            total_expenses += d['total_expenses']
+            total_income += d['total_income']
+            if d['date'] < mid_date:
+                first_half_expenses += d['total_expenses']
+            else:
+                second_half_expenses += d['total_expenses']
         avg_daily_expense = total_expenses / days if days > 0 else 0
         
         # Calculate trend using improved time-based algorithm
@@ -486,23 +621,6 @@ class DatabaseManager:
         trend_percent = 0.0
         
         if len(daily_data) >= 2:
-            # Calculate the midpoint date of the period
-            mid_date = (datetime.now() - timedelta(days=days//2)).strftime('%Y-%m-%d')
-            
-            # Split transactions by date into first half and second half of the TIME period
-            first_half_expenses = 0.0
-            second_half_expenses = 0.0
-            first_half_day_count = 0
-            second_half_day_count = 0
-            
-            for d in daily_data:
-                if d['date'] < mid_date:
-                    first_half_expenses += d['total_expenses']
-                    first_half_day_count += 1
-                else:
-                    second_half_expenses += d['total_expenses']
-                    second_half_day_count += 1
-            
             # Calculate actual days in each half of the time period (not just days with data)
             first_period_days = days // 2
             second_period_days = days - first_period_days
@@ -532,7 +650,6 @@ class DatabaseManager:
                 trend = 'stable'
         elif len(daily_data) == 1:
             # Only one day of data - check if it's recent (second half of period)
-            mid_date = (datetime.now() - timedelta(days=days//2)).strftime('%Y-%m-%d')
             if daily_data[0]['date'] >= mid_date and daily_data[0]['total_expenses'] > 0:
                 trend = 'increasing'
                 trend_percent = 100
@@ -638,43 +755,45 @@ class DatabaseManager:
     
     def recalculate_spending_stats(self):
         """Recalculate all spending stats from transactions (for data consistency)"""
-        # Clear all stats
-        self.execute("DELETE FROM spending_stats")
-        
-        # Recalculate from transactions
-        transactions = self.fetch_all(
-            """SELECT t.amount, c.id as category_id
-               FROM transactions t
-               JOIN categories c ON t.category_id = c.id
-               WHERE t.type = 'expense'
-               ORDER BY t.created_at ASC"""
-        )
-        
-        for tx in transactions:
-            self._update_spending_stats(tx['category_id'], tx['amount'])
+        with self.transaction():
+            # Clear all stats
+            self.execute("DELETE FROM spending_stats")
+
+            # Recalculate from transactions
+            transactions = self.fetch_all(
+                """SELECT t.amount, c.id as category_id
+                   FROM transactions t
+                   JOIN categories c ON t.category_id = c.id
+                   WHERE t.type = 'expense'
+                   ORDER BY t.created_at ASC"""
+            )
+
+            for tx in transactions:
+                self._update_spending_stats(tx['category_id'], tx['amount'])
     
     def recalculate_daily_spending(self):
         """Recalculate all daily spending aggregates from transactions (for data consistency)"""
-        # Clear all daily spending
-        self.execute("DELETE FROM daily_spending")
-        
-        # Recalculate from transactions grouped by date
-        daily_data = self.fetch_all(
-            """SELECT date,
-                      SUM(CASE WHEN type = 'income' THEN amount ELSE 0 END) as total_income,
-                      SUM(CASE WHEN type = 'expense' THEN amount ELSE 0 END) as total_expenses,
-                      COUNT(*) as transaction_count
-               FROM transactions
-               GROUP BY date
-               ORDER BY date ASC"""
-        )
-        
-        for day in daily_data:
-            self.execute(
-                """INSERT INTO daily_spending (date, total_income, total_expenses, transaction_count)
-                   VALUES (?, ?, ?, ?)""",
-                (day['date'], day['total_income'], day['total_expenses'], day['transaction_count'])
+        with self.transaction():
+            # Clear all daily spending
+            self.execute("DELETE FROM daily_spending")
+
+            # Recalculate from transactions grouped by date
+            daily_data = self.fetch_all(
+                """SELECT date,
+                          SUM(CASE WHEN type = 'income' THEN amount ELSE 0 END) as total_income,
+                          SUM(CASE WHEN type = 'expense' THEN amount ELSE 0 END) as total_expenses,
+                          COUNT(*) as transaction_count
+                   FROM transactions
+                   GROUP BY date
+                   ORDER BY date ASC"""
             )
+
+            for day in daily_data:
+                self.execute(
+                    """INSERT INTO daily_spending (date, total_income, total_expenses, transaction_count)
+                       VALUES (?, ?, ?, ?)""",
+                    (day['date'], day['total_income'], day['total_expenses'], day['transaction_count'])
+                )
     
     def _detect_anomaly_internal(self, cat_id: str, category: str, amount: float, threshold: float = 2.0) -> Dict:
         """Internal anomaly detection before stats are updated"""
@@ -751,12 +870,14 @@ class DatabaseManager:
     
     def get_all_anomalies(self, threshold: float = 2.0) -> List[Dict]:
         """Get all transactions flagged as anomalies at creation time"""
-        # Get transactions that were flagged as anomalies when added
+        # Get transactions that were flagged as anomalies when added, with
+        # their category's current stats joined in rather than queried per row
         transactions = self.fetch_all(
-            """SELECT t.id, t.amount, c.name as category, c.id as category_id, t.date, t.description,
-                      t.is_anomaly, t.z_score
+            """SELECT t.id, t.amount, c.name as category, t.date, t.description,
+                      t.z_score, s.mean_amount, s.std_dev
                FROM transactions t
                JOIN categories c ON t.category_id = c.id
+               LEFT JOIN spending_stats s ON s.category_id = t.category_id
                WHERE t.type = 'expense' AND t.is_anomaly = 1
                ORDER BY t.created_at DESC
                LIMIT 100"""
@@ -764,14 +885,9 @@ class DatabaseManager:
         
         anomalies = []
         for tx in transactions:
-            # Get the spending stats for this category to include mean
-            stats = self.fetch_one(
-                "SELECT mean_amount, std_dev FROM spending_stats WHERE category_id = ?",
-                (tx['category_id'],)
-            )
-            
-            mean_value = stats['mean_amount'] if stats else 0
-            std_dev_value = stats['std_dev'] if stats else 0
+            has_stats = tx['mean_amount'] is not None
+            mean_value = tx['mean_amount'] if has_stats else 0
+            std_dev_value = tx['std_dev'] if has_stats else 0
             
             anomalies.append({
                 'id': tx['id'],
@@ -804,40 +920,41 @@ class DatabaseManager:
     
     def undo(self) -> bool:
         """Undo last action"""
-        action = self.fetch_one(
-            "SELECT * FROM undo_actions ORDER BY id DESC LIMIT 1"
-        )
-        if not action:
-            return False
-        
-        self.execute("DELETE FROM undo_actions WHERE id = ?", (action['id'],))
-        
-        parts = action['action_data'].split('|')
-        action_type = action['action_type']
-        
-        if action_type == 0:  # ADD_TRANSACTION - undo by deleting
-            tx_id = parts[0]
-            self.execute("DELETE FROM transactions WHERE id = ?", (tx_id,))
-        elif action_type == 1:  # DELETE_TRANSACTION - undo by re-adding
-            tx_id, tx_type, amount, category, description, date = parts
-            cat_id = self.get_or_create_category(category)
-            self.execute(
-                "INSERT INTO transactions (id, type, amount, category_id, description, date) VALUES (?, ?, ?, ?, ?, ?)",
-                (tx_id, tx_type, float(amount), cat_id, description, date)
-            )
-        elif action_type == 2:  # ADD_BUDGET - undo by deleting
-            category = parts[0]
-            cat_id = self.get_or_create_category(category)
-            self.execute("DELETE FROM budgets WHERE category_id = ?", (cat_id,))
-        elif action_type == 3:  # UPDATE_BUDGET - restore old value
-            category, old_limit = parts
-            cat_id = self.get_or_create_category(category)
-            self.execute(
-                "UPDATE budgets SET budget_limit = ? WHERE category_id = ?",
-                (float(old_limit), cat_id)
+        with self.transaction():
+            action = self.fetch_one(
+                "SELECT * FROM undo_actions ORDER BY id DESC LIMIT 1"
             )
-        
-        return True
+            if not action:
+                return False
+
+            self.execute("DELETE FROM undo_actions WHERE id = ?", (action['id'],))
+
+            parts = action['action_data'].split('|')
+            action_type = action['action_type']
+
+            if action_type == 0:  # ADD_TRANSACTION - undo by deleting
+                tx_id = parts[0]
+                self.execute("DELETE FROM transactions WHERE id = ?", (tx_id,))
+            elif action_type == 1:  # DELETE_TRANSACTION - undo by re-adding
+                tx_id, tx_type, amount, category, description, date = parts
+                cat_id = self.get_or_create_category(category)
+                self.execute(
+                    "INSERT INTO transactions (id, type, amount, category_id, description, date) VALUES (?, ?, ?, ?, ?, ?)",
+                    (tx_id, tx_type, float(amount), cat_id, description, date)
+                )
+            elif action_type == 2:  # ADD_BUDGET - undo by deleting
+                category = parts[0]
+                cat_id = self.get_or_create_category(category)
+                self.execute("DELETE FROM budgets WHERE category_id = ?", (cat_id,))
+            elif action_type == 3:  # UPDATE_BUDGET - restore old value
+                category, old_limit = parts
+                cat_id = self.get_or_create_category(category)
+                self.execute(
+                    "UPDATE budgets SET budget_limit = ? WHERE category_id = ?",
+                    (float(old_limit), cat_id)
+                )
+
+            return True
     
     def can_undo(self) -> bool:
         """Check if undo is available"""
@@ -37,24 +37,28 @@ def migrate():
             transactions = data.get('transactions', [])
             print(f"Migrating {len(transactions)} transactions...")
             
-            for tx in transactions:
-                # Get or create category
-                cat_id = db.get_or_create_category(tx['category'])
+            with db.transaction():
+                rows = []
+                for tx in transactions:
+                    # Get or create category
+                    cat_id = db.get_or_create_category(tx['category'])
+                    rows.append((tx['id'], tx['type'], tx['amount'], cat_id,
+                                 tx.get('description', ''), tx['date']))
                 
-                # Insert transaction directly (bypass undo stack for migration)
-                db.execute(
+                # Insert transactions in one batch (bypass undo stack for migration)
+                db.execute_many(
                     """INSERT INTO transactions (id, type, amount, category_id, description, date)
                        VALUES (?, ?, ?, ?, ?, ?)""",
-                    (tx['id'], tx['type'], tx['amount'], cat_id, 
-                     tx.get('description', ''), tx['date'])
+                    rows
                 )
                 
-                # Update daily spending
-                db._update_daily_spending(tx['date'], tx['type'], tx['amount'], 1)
+                # Build daily spending once from the inserted rows
+                db.recalculate_daily_spending()
                 
-                # Update spending stats for expenses
-                if tx['type'] == 'expense':
-                    db._update_spending_stats(cat_id, tx['amount'])
+                # Feed Z-Score stats in file order; created_at ties within the batch
+                for row in rows:
+                    if row[1] == 'expense':
+                        db._update_spending_stats(row[3], row[2])
             
             print(f"  ✓ Migrated {len(transactions)} transactions")
     
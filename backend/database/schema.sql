@@ -85,6 +85,12 @@ CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions(date);
 CREATE INDEX IF NOT EXISTS idx_transactions_category ON transactions(category_id);
 CREATE INDEX IF NOT EXISTS idx_transactions_type ON transactions(type);
 CREATE INDEX IF NOT EXISTS idx_transactions_amount ON transactions(amount DESC);
+-- Top-k expense ranking walks this index instead of sorting
+CREATE INDEX IF NOT EXISTS idx_transactions_type_amount ON transactions(type, amount DESC);
+-- Covering index for per-category expense totals
+CREATE INDEX IF NOT EXISTS idx_transactions_type_category_amount ON transactions(type, category_id, amount);
+-- Covering index for date-range aggregates (trends, monthly summary)
+CREATE INDEX IF NOT EXISTS idx_transactions_date_type_amount ON transactions(date, type, amount);
 CREATE INDEX IF NOT EXISTS idx_bills_due_date ON bills(due_date);
 CREATE INDEX IF NOT EXISTS idx_bills_is_paid ON bills(is_paid);
 CREATE INDEX IF NOT EXISTS idx_daily_spending_date ON daily_spending(date);
@@ -0,0 +1,17 @@
+#!/usr/bin/env bash
+# Production entry point: uvloop event loop, httptools parser and a deep
+# accept backlog. Only a single worker is supported: the read cache and the
+# category index live in-process and are cleared only by writes handled in
+# that same process. The category index has no expiry, so with more than one
+# worker the others would never see new categories in /categories or
+# /categories/suggest.
+set -euo pipefail
+cd "$(dirname "$0")"
+
+exec uvicorn server:app \
+    --host "${HOST:-0.0.0.0}" \
+    --port "${PORT:-8001}" \
+    --loop uvloop \
+    --http httptools \
+    --workers 1 \
+    --backlog 4096
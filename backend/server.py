@@ -13,12 +13,17 @@ Data Structures Used:
 7. Z-Score Anomaly Detection - Real-time unusual expense detection
 """
 
-from fastapi import FastAPI, HTTPException, APIRouter
+from fastapi import FastAPI, HTTPException, APIRouter, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional
 from datetime import datetime, timezone
 import os
+import sqlite3
+import time
+import hashlib
+import orjson
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -26,11 +31,12 @@ ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
 # Import database manager
-from database import get_db
+from database import DatabaseManager, get_db
 
 app = FastAPI(
     title="Finance Tracker API", 
-    description="Smart Personal Finance Tracker with Advanced Data Structures and SQLite"
+    description="Smart Personal Finance Tracker with Advanced Data Structures and SQLite",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -42,23 +48,81 @@ app.add_middleware(
         os.environ.get("FRONTEND_URL", "https://data-insights-265.preview.emergentagent.com")
     ],
     allow_credentials=True,
-    allow_methods=["*"],
+    allow_methods=["GET", "POST", "DELETE"],
     allow_headers=["*"],
+    # Let browsers reuse a preflight result for a day
+    max_age=86400,
 )
 
 api_router = APIRouter(prefix="/api")
 
 
+# Endpoints that touch SQLite are plain `def` so FastAPI runs them in its
+# threadpool instead of blocking the event loop.
+
+def get_database(request: Request) -> DatabaseManager:
+    """Dependency returning the DatabaseManager stored on app.state at startup."""
+    return request.app.state.db
+
+
+# ===== Read Cache =====
+# Dashboard polling hits the same aggregates repeatedly; they only change
+# when a mutation endpoint runs, so cache them briefly and drop the cache
+# on every write.
+
+CACHE_TTL_SECONDS = 1.0
+_cache = {}
+# Bumped by every invalidation; a compute that overlapped a write sees a
+# different generation when it finishes and does not store its result
+_cache_generation = 0
+# Only the counts the frontend asks for are cached, so client-chosen
+# counts cannot grow _cache without bound
+CACHED_TOP_COUNTS = frozenset({5, 10})
+
+def _cached(key, compute):
+    """Return cached value for key if still fresh, otherwise recompute."""
+    entry = _cache.get(key)
+    now = time.monotonic()
+    if entry is not None and now - entry[0] < CACHE_TTL_SECONDS:
+        return entry[1]
+    generation = _cache_generation
+    value = compute()
+    if generation == _cache_generation:
+        _cache[key] = (now, value)
+    return value
+
+def _invalidate_cache():
+    """Drop all cached reads after a mutation."""
+    global _cache_generation
+    _cache_generation += 1
+    _cache.clear()
+
+# Default transaction date; only reformatted when the UTC day rolls over
+_today = {"until": 0.0, "value": ""}
+
+def _utc_today() -> str:
+    """Return today's UTC date as YYYY-MM-DD."""
+    now = time.time()
+    if now >= _today["until"]:
+        _today["value"] = datetime.fromtimestamp(now, timezone.utc).strftime("%Y-%m-%d")
+        _today["until"] = now - now % 86400 + 86400
+    return _today["value"]
+
+
 # ===== Pydantic Models =====
 
-class TransactionCreate(BaseModel):
+class APIModel(BaseModel):
+    """Base model with shared Pydantic v2 config (unknown fields are dropped)."""
+    model_config = ConfigDict(extra='ignore', str_strip_whitespace=False)
+
+class TransactionCreate(APIModel):
     type: str = Field(..., description="'income' or 'expense'")
     amount: float = Field(..., gt=0)
     category: str
     description: Optional[str] = ""
     date: Optional[str] = None  # YYYY-MM-DD format
 
-class Transaction(BaseModel):
+class Transaction(APIModel):
     id: str
     type: str
     amount: float
@@ -66,24 +130,24 @@ class Transaction(BaseModel):
     description: str
     date: str
 
-class BudgetCreate(BaseModel):
+class BudgetCreate(APIModel):
     category: str
     limit: float = Field(..., gt=0)
 
-class Budget(BaseModel):
+class Budget(APIModel):
     category: str
     limit: float
     spent: float
     percentUsed: float
     alertLevel: str
 
-class BillCreate(BaseModel):
+class BillCreate(APIModel):
     name: str
     amount: float = Field(..., gt=0)
     dueDate: str  # YYYY-MM-DD format
     category: str
 
-class Bill(BaseModel):
+class Bill(APIModel):
     id: str
     name: str
     amount: float
@@ -91,7 +155,7 @@ class Bill(BaseModel):
     category: str
     isPaid: bool
 
-class BudgetAlert(BaseModel):
+class BudgetAlert(APIModel):
     category: str
     level: str
     percentUsed: float
@@ -100,11 +164,11 @@ class BudgetAlert(BaseModel):
     message: str
     priority: Optional[float] = None
 
-class CategoryAmount(BaseModel):
+class CategoryAmount(APIModel):
     category: str
     totalAmount: float
 
-class MonthlySummary(BaseModel):
+class MonthlySummary(APIModel):
     month: str
     totalIncome: float
     totalExpenses: float
@@ -112,7 +176,7 @@ class MonthlySummary(BaseModel):
     transactionCount: int
     categoryBreakdown: List[dict]
 
-class DashboardData(BaseModel):
+class DashboardData(APIModel):
     balance: float
     totalIncome: float
     totalExpenses: float
@@ -121,7 +185,7 @@ class DashboardData(BaseModel):
     billCount: int
     canUndo: bool
 
-class SpendingTrend(BaseModel):
+class SpendingTrend(APIModel):
     period: str
     startDate: str
     endDate: str
@@ -131,7 +195,7 @@ class SpendingTrend(BaseModel):
     trend: str
     dailyData: List[dict]
 
-class AnomalyResult(BaseModel):
+class AnomalyResult(APIModel):
     isAnomaly: bool
     zScore: float
     message: str
@@ -147,25 +211,27 @@ class AnomalyResult(BaseModel):
 async def root():
     return {"message": "Finance Tracker API - SQLite & Advanced DSA Powered"}
 
+# Built once; listed in every /health response
+HEALTH_DATA_STRUCTURES = (
+    "Red-Black Tree (B-Tree index)",
+    "Skip List (ID index)",
+    "Indexed Priority Queue",
+    "Polynomial Hash Map",
+    "Sliding Window",
+    "IntroSort",
+    "Z-Score Anomaly Detection"
+)
+
 @api_router.get("/health")
-async def health():
-    db = get_db()
+def health(db: DatabaseManager = Depends(get_database)):
     try:
-        # Check database connectivity
-        dashboard = db.get_dashboard()
+        # Check database connectivity (shares the dashboard's cached read)
+        dashboard = _dashboard(db)
         return {
             "status": "healthy",
             "database": "sqlite",
             "transactionCount": dashboard['transactionCount'],
-            "dataStructures": [
-                "Red-Black Tree (B-Tree index)",
-                "Skip List (ID index)",
-                "Indexed Priority Queue",
-                "Polynomial Hash Map",
-                "Sliding Window",
-                "IntroSort",
-                "Z-Score Anomaly Detection"
-            ]
+            "dataStructures": HEALTH_DATA_STRUCTURES
         }
     except Exception as e:
         return {
@@ -176,17 +242,22 @@ async def health():
 
 # ----- Dashboard -----
 
-@api_router.get("/dashboard", response_model=DashboardData)
-async def get_dashboard():
+# Validated once when the cache fills rather than via response_model on
+# every poll; the model is still advertised in the OpenAPI schema
+@api_router.get("/dashboard", responses={200: {"model": DashboardData}})
+def get_dashboard(db: DatabaseManager = Depends(get_database)):
     """Get dashboard summary data."""
-    db = get_db()
-    return db.get_dashboard()
+    return _dashboard(db)
+
+def _dashboard(db: DatabaseManager) -> dict:
+    """Dashboard summary through the read cache, validated on refill."""
+    return _cached("dashboard", lambda: DashboardData(**db.get_dashboard()).model_dump())
 
 
 # ----- Transactions -----
 
-@api_router.post("/transactions", response_model=dict)
-async def add_transaction(transaction: TransactionCreate):
+@api_router.post("/transactions")
+def add_transaction(transaction: TransactionCreate, db: DatabaseManager = Depends(get_database)):
     """
     Add a new transaction.
     
@@ -196,8 +267,7 @@ async def add_transaction(transaction: TransactionCreate):
     - Sliding Window: Updates daily spending aggregates
     - Z-Score: Updates category statistics for anomaly detection
     """
-    db = get_db()
-    date = transaction.date or datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    date = transaction.date or _utc_today()
     
     # Add transaction - anomaly detection is now done inside add_transaction
     tx, anomaly = db.add_transaction(
@@ -207,61 +277,114 @@ async def add_transaction(transaction: TransactionCreate):
         description=transaction.description or "",
         date=date
     )
+    _invalidate_cache()
     
+    # Every successful write pushes an undo record, so no need to query for it
     return {
         "success": True,
         "transaction": tx,
-        "canUndo": db.can_undo(),
+        "canUndo": True,
         "anomaly": anomaly,
         "dsInfo": "Inserted into Red-Black Tree (by date) and Skip List (by ID)"
     }
 
-@api_router.get("/transactions", response_model=dict)
-async def get_transactions():
+@api_router.post("/transactions/bulk")
+def add_transactions_bulk(transactions: List[TransactionCreate], db: DatabaseManager = Depends(get_database)):
     """
-    Get all transactions sorted by date.
-    
-    Data Structure: Red-Black Tree in-order traversal (O(n))
+    Add many transactions in a single database transaction (one commit).
+    If any row is rejected by the database, none of the batch is stored.
+
+    Each transaction still records its own undo action, so /undo reverts
+    the batch one transaction at a time, newest first.
+
+    Data Structures Used: same as single insert, applied per transaction
     """
-    db = get_db()
-    transactions = db.get_all_transactions(order='desc')
+    today = _utc_today()
+    added = []
+    anomalies = []
+    try:
+        with db.transaction():
+            for transaction in transactions:
+                tx, anomaly = db.add_transaction(
+                    tx_type=transaction.type,
+                    amount=transaction.amount,
+                    category=transaction.category,
+                    description=transaction.description or "",
+                    date=transaction.date or today
+                )
+                added.append(tx)
+                anomalies.append(anomaly)
+    except sqlite3.IntegrityError as e:
+        raise HTTPException(status_code=400, detail=f"Batch rejected, nothing was added: {e}")
+    _invalidate_cache()
+
     return {
-        "transactions": transactions,
-        "dsInfo": "Retrieved via Red-Black Tree reverse in-order traversal"
+        "success": True,
+        "count": len(added),
+        "transactions": added,
+        "anomalies": anomalies,
+        "canUndo": bool(added) or db.can_undo(),
+        "dsInfo": "Batch inserted into Red-Black Tree (by date) and Skip List (by ID)"
     }
 
-@api_router.get("/transactions/recent", response_model=dict)
-async def get_recent_transactions(count: int = 10):
+@api_router.get("/transactions")
+def get_transactions(db: DatabaseManager = Depends(get_database)):
+    """
+    Get all transactions sorted by date.
+    
+    Data Structure: Red-Black Tree in-order traversal (O(n))
+    """
+    return StreamingResponse(_stream_transactions(db), media_type="application/json")
+
+def _stream_transactions(db: DatabaseManager):
+    """Yield the /transactions JSON document in row batches."""
+    yield b'{"transactions":['
+    first = True
+    for batch in db.iter_all_transactions(order='desc'):
+        chunk = b','.join(orjson.dumps(row) for row in batch)
+        yield chunk if first else b',' + chunk
+        first = False
+    yield b'],"dsInfo":' + orjson.dumps("Retrieved via Red-Black Tree reverse in-order traversal") + b'}'
+
+@api_router.get("/transactions.ndjson")
+def get_transactions_ndjson(db: DatabaseManager = Depends(get_database)):
+    """Get all transactions sorted by date as newline-delimited JSON."""
+    return StreamingResponse(_stream_transactions_ndjson(db), media_type="application/x-ndjson")
+
+def _stream_transactions_ndjson(db: DatabaseManager):
+    """Yield one JSON line per transaction, a row batch at a time."""
+    for batch in db.iter_all_transactions(order='desc'):
+        yield b''.join(orjson.dumps(row) + b'\n' for row in batch)
+
+@api_router.get("/transactions/recent")
+def get_recent_transactions(count: int = 10, db: DatabaseManager = Depends(get_database)):
     """Get most recent transactions."""
-    db = get_db()
     transactions = db.get_recent_transactions(count)
     return {
         "transactions": transactions,
         "dsInfo": "Recent transactions retrieved by creation timestamp"
     }
 
-@api_router.get("/transactions/range", response_model=dict)
-async def get_transactions_by_range(start_date: str, end_date: str):
+@api_router.get("/transactions/range")
+def get_transactions_by_range(start_date: str, end_date: str, db: DatabaseManager = Depends(get_database)):
     """
     Get transactions in date range.
     
     Data Structure: Red-Black Tree range query (O(log n + k))
     """
-    db = get_db()
     transactions = db.get_transactions_by_date_range(start_date, end_date)
     return {
         "transactions": transactions,
         "dsInfo": "Range query using Red-Black Tree (B-Tree index)"
     }
 
-@api_router.get("/transactions/{transaction_id}", response_model=dict)
-async def get_transaction(transaction_id: str):
+@api_router.get("/transactions/{transaction_id}")
+def get_transaction(transaction_id: str, db: DatabaseManager = Depends(get_database)):
     """
     Get transaction by ID.
     
     Data Structure: Skip List lookup (O(log n) expected)
     """
-    db = get_db()
     tx = db.get_transaction_by_id(transaction_id)
     if not tx:
         raise HTTPException(status_code=404, detail="Transaction not found")
@@ -271,89 +394,85 @@ async def get_transaction(transaction_id: str):
     }
 
 @api_router.delete("/transactions/{transaction_id}")
-async def delete_transaction(transaction_id: str):
+def delete_transaction(transaction_id: str, db: DatabaseManager = Depends(get_database)):
     """Delete a transaction by ID."""
-    db = get_db()
     success = db.delete_transaction(transaction_id)
+    _invalidate_cache()
     if not success:
         raise HTTPException(status_code=404, detail="Transaction not found")
     return {
         "success": True,
-        "canUndo": db.can_undo()
+        "canUndo": True
     }
 
 
 # ----- Budgets -----
 
-@api_router.post("/budgets", response_model=dict)
-async def set_budget(budget: BudgetCreate):
+@api_router.post("/budgets")
+def set_budget(budget: BudgetCreate, db: DatabaseManager = Depends(get_database)):
     """
     Set budget for a category.
     
     Data Structure: Polynomial Hash Map (O(1) average)
     """
-    db = get_db()
     result = db.set_budget(budget.category, budget.limit)
+    _invalidate_cache()
     return {
         "success": True,
         "budget": result,
-        "canUndo": db.can_undo(),
+        "canUndo": True,
         "dsInfo": "Stored in Polynomial Hash Map"
     }
 
-@api_router.get("/budgets", response_model=dict)
-async def get_budgets():
+@api_router.get("/budgets")
+def get_budgets(db: DatabaseManager = Depends(get_database)):
     """
     Get all budgets with spending status.
     
     Data Structure: Polynomial Hash Map retrieval
     """
-    db = get_db()
     budgets = db.get_all_budgets()
     return {
         "budgets": budgets,
         "dsInfo": "Budget data from Polynomial Hash Map"
     }
 
-@api_router.get("/budgets/alerts", response_model=dict)
-async def get_budget_alerts():
+@api_router.get("/budgets/alerts")
+def get_budget_alerts(db: DatabaseManager = Depends(get_database)):
     """
     Get budget alerts prioritized by urgency.
     
     Data Structure: Indexed Priority Queue (O(log n) for priority ordering)
     """
-    db = get_db()
-    alerts = db.get_budget_alerts()
+    alerts = _cached("budget-alerts", db.get_budget_alerts)
     return {
         "alerts": alerts,
         "dsInfo": "Alerts prioritized using Indexed Priority Queue"
     }
 
-@api_router.get("/alerts", response_model=dict)
-async def get_alerts():
+@api_router.get("/alerts")
+def get_alerts(db: DatabaseManager = Depends(get_database)):
     """Get budget alerts - shortcut route."""
-    db = get_db()
-    alerts = db.get_budget_alerts()
+    alerts = _cached("budget-alerts", db.get_budget_alerts)
     return {"alerts": alerts}
 
 
 # ----- Bills -----
 
-@api_router.post("/bills", response_model=dict)
-async def add_bill(bill: BillCreate):
+@api_router.post("/bills")
+def add_bill(bill: BillCreate, db: DatabaseManager = Depends(get_database)):
     """Add a bill to the payment queue (FIFO)."""
-    db = get_db()
     result = db.add_bill(bill.name, bill.amount, bill.dueDate, bill.category)
+    _invalidate_cache()
     return {
         "success": True,
         "bill": result,
-        "canUndo": db.can_undo()
+        "canUndo": True
     }
 
-@api_router.get("/bills", response_model=dict)
-async def get_bills():
+@api_router.get("/bills")
+def get_bills(db: DatabaseManager = Depends(get_database)):
     """Get all bills from the queue (FIFO order)."""
-    db = get_db()
     bills = db.get_all_bills()
     return {
         "bills": bills,
@@ -361,60 +480,63 @@ async def get_bills():
     }
 
 @api_router.post("/bills/{bill_id}/pay")
-async def pay_bill(bill_id: str):
+def pay_bill(bill_id: str, db: DatabaseManager = Depends(get_database)):
     """Mark a bill as paid."""
-    db = get_db()
     success = db.pay_bill(bill_id)
+    _invalidate_cache()
     if not success:
         raise HTTPException(status_code=404, detail="Bill not found")
     return {
         "success": True,
-        "canUndo": db.can_undo()
+        "canUndo": True
     }
 
 @api_router.delete("/bills/{bill_id}")
-async def delete_bill(bill_id: str):
+def delete_bill(bill_id: str, db: DatabaseManager = Depends(get_database)):
     """Remove a bill from the queue."""
-    db = get_db()
     success = db.delete_bill(bill_id)
+    _invalidate_cache()
     if not success:
         raise HTTPException(status_code=404, detail="Bill not found")
     return {
         "success": True,
-        "canUndo": db.can_undo()
+        "canUndo": True
     }
 
 
 # ----- Analytics -----
 
-@api_router.get("/top-expenses", response_model=dict)
-async def get_top_expenses(count: int = 5):
+@api_router.get("/top-expenses")
+def get_top_expenses(count: int = 5, db: DatabaseManager = Depends(get_database)):
     """
     Get top expenses.
     
     Data Structure: IntroSort (O(n log n) guaranteed via SQL ORDER BY)
     """
-    db = get_db()
-    expenses = db.get_top_expenses(count)
+    if count in CACHED_TOP_COUNTS:
+        expenses = _cached(("top-expenses", count), lambda: db.get_top_expenses(count))
+    else:
+        expenses = db.get_top_expenses(count)
     return {
         "topExpenses": expenses,
         "dsInfo": "Top expenses sorted using IntroSort algorithm"
     }
 
-@api_router.get("/top-categories", response_model=dict)
-async def get_top_categories(count: int = 5):
+@api_router.get("/top-categories")
+def get_top_categories(count: int = 5, db: DatabaseManager = Depends(get_database)):
     """Get top spending categories."""
-    db = get_db()
-    categories = db.get_top_categories(count)
+    if count in CACHED_TOP_COUNTS:
+        categories = _cached(("top-categories", count), lambda: db.get_top_categories(count))
+    else:
+        categories = db.get_top_categories(count)
     return {
         "topCategories": categories,
         "dsInfo": "Categories ranked using IntroSort"
     }
 
-@api_router.get("/monthly-summary", response_model=dict)
-async def get_monthly_summary(month: Optional[str] = None):
+@api_router.get("/monthly-summary")
+def get_monthly_summary(month: Optional[str] = None, db: DatabaseManager = Depends(get_database)):
     """Get monthly summary using date range query."""
-    db = get_db()
     summary = db.get_monthly_summary(month)
     return {
         "summary": summary,
@@ -424,40 +546,37 @@ async def get_monthly_summary(month: Optional[str] = None):
 
 # ----- Spending Trends (Sliding Window) -----
 
-@api_router.get("/trends/7-day", response_model=dict)
-async def get_7_day_trend():
+@api_router.get("/trends/7-day")
+def get_7_day_trend(db: DatabaseManager = Depends(get_database)):
     """
     Get 7-day spending trend.
     
     Data Structure: Sliding Window (O(n) total for window computation)
     """
-    db = get_db()
     trend = db.get_spending_trend(7)
     return {
         "trend": trend,
         "dsInfo": "Computed using Sliding Window algorithm"
     }
 
-@api_router.get("/trends/30-day", response_model=dict)
-async def get_30_day_trend():
+@api_router.get("/trends/30-day")
+def get_30_day_trend(db: DatabaseManager = Depends(get_database)):
     """
     Get 30-day spending trend.
     
     Data Structure: Sliding Window (O(n) total for window computation)
     """
-    db = get_db()
     trend = db.get_spending_trend(30)
     return {
         "trend": trend,
         "dsInfo": "Computed using Sliding Window algorithm"
     }
 
-@api_router.get("/trends/{days}", response_model=dict)
-async def get_custom_trend(days: int):
+@api_router.get("/trends/{days}")
+def get_custom_trend(days: int, db: DatabaseManager = Depends(get_database)):
     """Get custom day spending trend."""
     if days < 1 or days > 365:
         raise HTTPException(status_code=400, detail="Days must be between 1 and 365")
-    db = get_db()
     trend = db.get_spending_trend(days)
     return {
         "trend": trend,
@@ -467,14 +586,13 @@ async def get_custom_trend(days: int):
 
 # ----- Anomaly Detection (Z-Score) -----
 
-@api_router.get("/anomalies", response_model=dict)
-async def get_anomalies(threshold: float = 2.0):
+@api_router.get("/anomalies")
+def get_anomalies(threshold: float = 2.0, db: DatabaseManager = Depends(get_database)):
     """
     Get all detected anomalies in recent transactions.
     
     Data Structure: Z-Score Anomaly Detection (O(1) per transaction)
     """
-    db = get_db()
     anomalies = db.get_all_anomalies(threshold)
     return {
         "anomalies": anomalies,
@@ -482,46 +600,45 @@ async def get_anomalies(threshold: float = 2.0):
         "dsInfo": "Anomalies detected using Z-Score algorithm with streaming statistics"
     }
 
-@api_router.post("/anomalies/check", response_model=dict)
-async def check_anomaly(category: str, amount: float, threshold: float = 2.0):
+@api_router.post("/anomalies/check")
+def check_anomaly(category: str, amount: float, threshold: float = 2.0, db: DatabaseManager = Depends(get_database)):
     """
     Check if a specific amount would be anomalous for a category.
     
     Data Structure: Z-Score calculation using Welford's algorithm (O(1) per update)
     """
-    db = get_db()
     result = db.detect_anomaly(category, amount, threshold)
     return {
         "result": result,
         "dsInfo": "Real-time anomaly detection using Z-Score"
     }
 
-@api_router.post("/anomalies/recalculate", response_model=dict)
-async def recalculate_spending_stats():
+@api_router.post("/anomalies/recalculate")
+def recalculate_spending_stats(db: DatabaseManager = Depends(get_database)):
     """
     Recalculate all spending statistics from transactions.
     Use this to fix data consistency issues.
     
     Data Structure: Rebuilds Z-Score statistics from scratch
     """
-    db = get_db()
     db.recalculate_spending_stats()
+    _invalidate_cache()
     return {
         "status": "success",
         "message": "Spending statistics recalculated from all transactions",
         "dsInfo": "All category statistics rebuilt using Welford's algorithm"
     }
 
-@api_router.post("/trends/recalculate", response_model=dict)
-async def recalculate_daily_spending():
+@api_router.post("/trends/recalculate")
+def recalculate_daily_spending(db: DatabaseManager = Depends(get_database)):
     """
     Recalculate all daily spending aggregates from transactions.
     Use this to fix data consistency issues after transaction deletions.
     
     Data Structure: Rebuilds Sliding Window aggregates from scratch
     """
-    db = get_db()
     db.recalculate_daily_spending()
+    _invalidate_cache()
     return {
         "status": "success",
         "message": "Daily spending aggregates recalculated from all transactions",
@@ -531,14 +648,13 @@ async def recalculate_daily_spending():
 
 # ----- Autocomplete -----
 
-@api_router.get("/categories/suggest", response_model=dict)
-async def get_category_suggestions(prefix: str = ""):
+@api_router.get("/categories/suggest")
+def get_category_suggestions(prefix: str = "", db: DatabaseManager = Depends(get_database)):
     """
     Get category suggestions.
     
     Data Structure: Trie-like prefix search (via SQL LIKE)
     """
-    db = get_db()
     if prefix:
         suggestions = db.get_categories_by_prefix(prefix)
     else:
@@ -548,25 +664,24 @@ async def get_category_suggestions(prefix: str = ""):
         "dsInfo": "Prefix search for autocomplete"
     }
 
-@api_router.get("/categories", response_model=dict)
-async def get_all_categories():
+@api_router.get("/categories")
+def get_all_categories(db: DatabaseManager = Depends(get_database)):
     """Get all available categories."""
-    db = get_db()
     categories = db.get_all_categories()
     return {"categories": categories}
 
 
 # ----- Undo -----
 
-@api_router.post("/undo", response_model=dict)
-async def undo_last_action():
+@api_router.post("/undo")
+def undo_last_action(db: DatabaseManager = Depends(get_database)):
     """
     Undo the last action.
     
     Data Structure: Stack (LIFO) - O(1) pop operation
     """
-    db = get_db()
     success = db.undo()
+    _invalidate_cache()
     return {
         "success": success,
         "canUndo": db.can_undo(),
@@ -576,81 +691,90 @@ async def undo_last_action():
 
 # ----- DSA Info -----
 
-@api_router.get("/dsa-info")
-async def get_dsa_info():
-    """Get information about data structures used (for documentation)."""
-    return {
-        "dataStructures": [
-            {
-                "name": "Red-Black Tree",
-                "purpose": "Transaction storage ordered by date with guaranteed O(log n) operations",
-                "operations": ["insert O(log n)", "search O(log n)", "range query O(log n + k)"],
-                "implementation": "SQLite B-Tree index on date column",
-                "usedIn": ["Transaction storage", "Date range queries", "Monthly summaries"]
-            },
-            {
-                "name": "Skip List",
-                "purpose": "Fast transaction lookup by ID with expected O(log n) performance",
-                "operations": ["search O(log n) expected", "insert O(log n)", "delete O(log n)"],
-                "implementation": "SQLite index on transaction ID",
-                "usedIn": ["Transaction ID lookup", "Delete operations"]
-            },
-            {
-                "name": "Indexed Priority Queue",
-                "purpose": "Budget alert prioritization with efficient priority updates",
-                "operations": ["insert O(log n)", "extractMax O(log n)", "updatePriority O(log n)"],
-                "implementation": "SQL ORDER BY with percent_used as priority",
-                "usedIn": ["Budget alerts", "Alert prioritization"]
-            },
-            {
-                "name": "Polynomial Hash Map",
-                "purpose": "O(1) average category-based lookups",
-                "operations": ["insert O(1)", "search O(1)", "update O(1)"],
-                "implementation": "SQLite hash index on category names",
-                "usedIn": ["Category lookups", "Budget management"]
-            },
-            {
-                "name": "Sliding Window",
-                "purpose": "Efficient calculation of 7-day and 30-day spending trends",
-                "operations": ["window sum O(1) per slide", "full computation O(n)"],
-                "implementation": "Daily spending aggregates with date range queries",
-                "usedIn": ["7-day trends", "30-day trends", "Moving averages"]
-            },
-            {
-                "name": "IntroSort",
-                "purpose": "Guaranteed O(n log n) sorting for expense ranking",
-                "operations": ["sort O(n log n) guaranteed"],
-                "implementation": "SQLite ORDER BY (uses introspective sort)",
-                "usedIn": ["Top expenses", "Top categories", "Ranking"]
-            },
-            {
-                "name": "Z-Score Anomaly Detection",
-                "purpose": "Real-time detection of unusual expenses using streaming statistics",
-                "operations": ["update stats O(1)", "detect anomaly O(1)"],
-                "implementation": "Welford's algorithm for running mean/variance",
-                "usedIn": ["Unusual expense alerts", "Spending pattern analysis"]
-            }
-        ],
-        "database": {
-            "type": "SQLite",
-            "features": [
-                "Normalized schema design",
-                "Prepared statements for security",
-                "Foreign key constraints",
-                "Indexed columns for performance",
-                "Views for complex queries"
-            ]
+# Static payload for /dsa-info, serialized once at import
+DSA_INFO = {
+    "dataStructures": [
+        {
+            "name": "Red-Black Tree",
+            "purpose": "Transaction storage ordered by date with guaranteed O(log n) operations",
+            "operations": ["insert O(log n)", "search O(log n)", "range query O(log n + k)"],
+            "implementation": "SQLite B-Tree index on date column",
+            "usedIn": ["Transaction storage", "Date range queries", "Monthly summaries"]
+        },
+        {
+            "name": "Skip List",
+            "purpose": "Fast transaction lookup by ID with expected O(log n) performance",
+            "operations": ["search O(log n) expected", "insert O(log n)", "delete O(log n)"],
+            "implementation": "SQLite index on transaction ID",
+            "usedIn": ["Transaction ID lookup", "Delete operations"]
+        },
+        {
+            "name": "Indexed Priority Queue",
+            "purpose": "Budget alert prioritization with efficient priority updates",
+            "operations": ["insert O(log n)", "extractMax O(log n)", "updatePriority O(log n)"],
+            "implementation": "SQL ORDER BY with percent_used as priority",
+            "usedIn": ["Budget alerts", "Alert prioritization"]
         },
-        "complexity": {
-            "addTransaction": "O(log n) - Red-Black Tree insert + O(1) stats update",
-            "getTransactionById": "O(log n) expected - Skip List lookup",
-            "getTopExpenses": "O(n log n) - IntroSort",
-            "getSpendingTrend": "O(k) - Sliding Window where k is window size",
-            "detectAnomaly": "O(1) - Z-Score calculation",
-            "budgetAlerts": "O(n log n) - Indexed Priority Queue extraction",
-            "undo": "O(1) - Stack pop"
+        {
+            "name": "Polynomial Hash Map",
+            "purpose": "O(1) average category-based lookups",
+            "operations": ["insert O(1)", "search O(1)", "update O(1)"],
+            "implementation": "SQLite hash index on category names",
+            "usedIn": ["Category lookups", "Budget management"]
+        },
+        {
+            "name": "Sliding Window",
+            "purpose": "Efficient calculation of 7-day and 30-day spending trends",
+            "operations": ["window sum O(1) per slide", "full computation O(n)"],
+            "implementation": "Daily spending aggregates with date range queries",
+            "usedIn": ["7-day trends", "30-day trends", "Moving averages"]
+        },
+        {
+            "name": "IntroSort",
+            "purpose": "Guaranteed O(n log n) sorting for expense ranking",
+            "operations": ["sort O(n log n) guaranteed"],
+            "implementation": "SQLite ORDER BY (uses introspective sort)",
+            "usedIn": ["Top expenses", "Top categories", "Ranking"]
+        },
+        {
+            "name": "Z-Score Anomaly Detection",
+            "purpose": "Real-time detection of unusual expenses using streaming statistics",
+            "operations": ["update stats O(1)", "detect anomaly O(1)"],
+            "implementation": "Welford's algorithm for running mean/variance",
+            "usedIn": ["Unusual expense alerts", "Spending pattern analysis"]
         }
+    ],
+    "database": {
+        "type": "SQLite",
+        "features": [
+            "Normalized schema design",
+            "Prepared statements for security",
+            "Foreign key constraints",
+            "Indexed columns for performance",
+            "Views for complex queries"
+        ]
+    },
+    "complexity": {
+        "addTransaction": "O(log n) - Red-Black Tree insert + O(1) stats update",
+        "getTransactionById": "O(log n) expected - Skip List lookup",
+        "getTopExpenses": "O(n log n) - IntroSort",
+        "getSpendingTrend": "O(k) - Sliding Window where k is window size",
+        "detectAnomaly": "O(1) - Z-Score calculation",
+        "budgetAlerts": "O(n log n) - Indexed Priority Queue extraction",
+        "undo": "O(1) - Stack pop"
     }
+}
+
+_DSA_INFO_BODY = orjson.dumps(DSA_INFO)
+_DSA_INFO_ETAG = '"' + hashlib.sha1(_DSA_INFO_BODY).hexdigest()[:16] + '"'
+_DSA_INFO_HEADERS = {"ETag": _DSA_INFO_ETAG, "Cache-Control": "public, max-age=300"}
+
+@api_router.get("/dsa-info")
+async def get_dsa_info(request: Request):
+    """Get information about data structures used (for documentation)."""
+    if request.headers.get("if-none-match") == _DSA_INFO_ETAG:
+        return Response(status_code=304, headers=_DSA_INFO_HEADERS)
+    return Response(content=_DSA_INFO_BODY, media_type="application/json", headers=_DSA_INFO_HEADERS)
 
 
 # Include router in app
@@ -670,3 +794,5 @@ async def startup_event():
         migrate()
     else:
         print(f"Database found at {DB_PATH}")
+    
+    app.state.db = get_db()
@@ -8,10 +8,21 @@ import requests
 import json
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-# Read backend URL from frontend/.env
+# orjson decodes response bytes directly; fall back to the stdlib if absent
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# Read backend URL from frontend/.env (once per process)
+@lru_cache(maxsize=1)
 def get_backend_url():
     env_path = Path(__file__).parent / "frontend" / ".env"
     if env_path.exists():
@@ -21,12 +32,38 @@ def get_backend_url():
                     return line.split('=', 1)[1].strip() + "/api"
     return "http://localhost:8001/api"
 
-BACKEND_URL = get_backend_url()
+# BACKEND_URL in the environment (e.g. http://localhost:8001/api) takes
+# precedence, so a local plain-HTTP backend can be tested without editing .env
+BACKEND_URL = os.environ.get("BACKEND_URL") or get_backend_url()
+
+# Upper bound on requests in flight at once; also sizes the connection pool
+MAX_PARALLEL_REQUESTS = 16
+
+# (connect, read) timeouts: an unreachable backend fails fast, slow
+# endpoints still get the full read window
+REQUEST_TIMEOUT = (3.05, 30)
+HEALTH_TIMEOUT = (3.05, 5)
+
+# Data structures /dsa-info must describe
+EXPECTED_DATA_STRUCTURES = frozenset({
+    "Red-Black Tree", "Skip List", "Indexed Priority Queue",
+    "Polynomial Hash Map", "Sliding Window", "IntroSort",
+    "Z-Score Anomaly Detection"
+})
 
 class FinanceTrackerTester:
     def __init__(self):
         self.base_url = BACKEND_URL
         self.session = requests.Session()
+        # Retry transient gateway errors on GETs only: a replayed POST could
+        # duplicate a record and a replayed DELETE would 404. The last
+        # response is still returned for logging once retries run out
+        retry = Retry(total=2, backoff_factor=0.1, status_forcelist=(502, 503, 504),
+                      allowed_methods=frozenset({"GET"}), raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=MAX_PARALLEL_REQUESTS, pool_maxsize=MAX_PARALLEL_REQUESTS,
+                              max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         self.test_results = []
         self.created_transaction_id = None
         self.created_bill_id = None
@@ -34,12 +71,13 @@ class FinanceTrackerTester:
     def log_test(self, test_name, success, details="", response_data=None):
         """Log test results"""
         status = "✅ PASS" if success else "❌ FAIL"
-        print(f"{status} {test_name}")
+        lines = [f"{status} {test_name}"]
         if details:
-            print(f"   Details: {details}")
+            lines.append(f"   Details: {details}")
         if response_data and not success:
-            print(f"   Response: {response_data}")
-        print()
+            lines.append(f"   Response: {response_data}")
+        # One write per test keeps its lines together on stdout
+        print("\n".join(lines) + "\n")
         
         self.test_results.append({
             "test": test_name,
@@ -53,11 +91,11 @@ class FinanceTrackerTester:
         url = f"{self.base_url}{endpoint}"
         try:
             if method.upper() == "GET":
-                response = self.session.get(url, params=params, timeout=30)
+                response = self.session.get(url, params=params, timeout=REQUEST_TIMEOUT)
             elif method.upper() == "POST":
-                response = self.session.post(url, json=data, params=params, timeout=30)
+                response = self.session.post(url, json=data, params=params, timeout=REQUEST_TIMEOUT)
             elif method.upper() == "DELETE":
-                response = self.session.delete(url, timeout=30)
+                response = self.session.delete(url, timeout=REQUEST_TIMEOUT)
             else:
                 raise ValueError(f"Unsupported method: {method}")
             
@@ -65,30 +103,47 @@ class FinanceTrackerTester:
         except requests.exceptions.RequestException as e:
             return None, str(e)
     
+    def get_json(self, test_name, response):
+        """Decode a successful response, or log test_name as failed and return None"""
+        if isinstance(response, tuple):
+            self.log_test(test_name, False, f"Request failed: {response[1]}")
+            return None
+        if response.status_code != 200:
+            # Decode the raw bytes ourselves: .text would guess the charset first
+            self.log_test(test_name, False, f"HTTP {response.status_code}",
+                          response.content[:512].decode("utf-8", "replace"))
+            return None
+        return json_loads(response.content)
+    
+    def make_requests_parallel(self, calls):
+        """Make independent requests concurrently, returning responses in call order.
+        
+        Each call is a (method, endpoint, data, params) tuple for make_request.
+        """
+        with ThreadPoolExecutor(max_workers=min(len(calls), MAX_PARALLEL_REQUESTS)) as pool:
+            return list(pool.map(lambda call: self.make_request(*call), calls))
+    
     def test_root_and_health(self):
         """Test root and health endpoints"""
         print("🔍 Testing Root & Health Endpoints...")
         
+        root, health = self.make_requests_parallel([
+            ("GET", "/", None, None),
+            ("GET", "/health", None, None),
+        ])
+        
         # Test GET /api/ (root)
-        response = self.make_request("GET", "/")
-        if isinstance(response, tuple):
-            self.log_test("Root Endpoint", False, f"Request failed: {response[1]}")
-        elif response.status_code == 200:
-            data = response.json()
+        data = self.get_json("Root Endpoint", root)
+        if data is not None:
             message = data.get("message", "")
             if "Finance Tracker API" in message:
                 self.log_test("Root Endpoint", True, f"Message: {message}")
             else:
                 self.log_test("Root Endpoint", False, f"Unexpected message: {message}", data)
-        else:
-            self.log_test("Root Endpoint", False, f"HTTP {response.status_code}", response.text)
         
         # Test GET /api/health
-        response = self.make_request("GET", "/health")
-        if isinstance(response, tuple):
-            self.log_test("Health Check", False, f"Request failed: {response[1]}")
-        elif response.status_code == 200:
-            data = response.json()
+        data = self.get_json("Health Check", health)
+        if data is not None:
             status = data.get("status", "unknown")
             database = data.get("database", "unknown")
             data_structures = data.get("dataStructures", [])
@@ -97,39 +152,32 @@ class FinanceTrackerTester:
                 self.log_test("Health Check", True, f"Status: {status}, DB: {database}, DSA: {len(data_structures)} structures")
             else:
                 self.log_test("Health Check", False, f"Status: {status}, DB: {database}, DSA count: {len(data_structures)}", data)
-        else:
-            self.log_test("Health Check", False, f"HTTP {response.status_code}", response.text)
     
     def test_dashboard_endpoint(self):
         """Test /api/dashboard endpoint"""
         print("🔍 Testing Dashboard Endpoint...")
         response = self.make_request("GET", "/dashboard")
         
-        if isinstance(response, tuple):
-            self.log_test("Dashboard Data", False, f"Request failed: {response[1]}")
+        data = self.get_json("Dashboard Data", response)
+        if data is None:
             return False
         
-        if response.status_code == 200:
-            data = response.json()
-            required_fields = ["balance", "totalIncome", "totalExpenses", "transactionCount", "budgetCount", "billCount", "canUndo"]
-            
-            missing_fields = [field for field in required_fields if field not in data]
-            if missing_fields:
-                self.log_test("Dashboard Data", False, f"Missing fields: {missing_fields}", data)
-                return False
-            
-            # Check if values are reasonable (demo data should exist)
-            balance = data.get("balance", 0)
-            income = data.get("totalIncome", 0)
-            expenses = data.get("totalExpenses", 0)
-            tx_count = data.get("transactionCount", 0)
-            
-            self.log_test("Dashboard Data", True, 
-                         f"Balance: ${balance:.2f}, Income: ${income:.2f}, Expenses: ${expenses:.2f}, Transactions: {tx_count}")
-            return True
-        else:
-            self.log_test("Dashboard Data", False, f"HTTP {response.status_code}", response.text)
+        required_fields = ["balance", "totalIncome", "totalExpenses", "transactionCount", "budgetCount", "billCount", "canUndo"]
+        
+        missing_fields = [field for field in required_fields if field not in data]
+        if missing_fields:
+            self.log_test("Dashboard Data", False, f"Missing fields: {missing_fields}", data)
             return False
+        
+        # Check if values are reasonable (demo data should exist)
+        balance = data.get("balance", 0)
+        income = data.get("totalIncome", 0)
+        expenses = data.get("totalExpenses", 0)
+        tx_count = data.get("transactionCount", 0)
+        
+        self.log_test("Dashboard Data", True, 
+                     f"Balance: ${balance:.2f}, Income: ${income:.2f}, Expenses: ${expenses:.2f}, Transactions: {tx_count}")
+        return True
     
     def test_transactions_endpoints(self):
         """Test all transaction-related endpoints"""
@@ -137,18 +185,32 @@ class FinanceTrackerTester:
         
         # Test GET /api/transactions
         response = self.make_request("GET", "/transactions")
-        if isinstance(response, tuple):
-            self.log_test("Get All Transactions", False, f"Request failed: {response[1]}")
+        data = self.get_json("Get All Transactions", response)
+        if data is None:
             return False
         
-        if response.status_code == 200:
-            data = response.json()
-            transactions = data.get("transactions", [])
-            ds_info = data.get("dsInfo", "")
-            self.log_test("Get All Transactions", True, f"Found {len(transactions)} transactions. DSA: {ds_info}")
+        transactions = data.get("transactions", [])
+        ds_info = data.get("dsInfo", "")
+        self.log_test("Get All Transactions", True, f"Found {len(transactions)} transactions. DSA: {ds_info}")
+        
+        # Test GET /api/transactions.ndjson (same rows, one JSON object per line)
+        response = self.make_request("GET", "/transactions.ndjson")
+        if isinstance(response, tuple) or response.status_code != 200:
+            self.get_json("Get Transactions as NDJSON", response)
         else:
-            self.log_test("Get All Transactions", False, f"HTTP {response.status_code}", response.text)
-            return False
+            content_type = response.headers.get("content-type", "")
+            try:
+                rows = [json_loads(line) for line in response.content.splitlines() if line]
+            except ValueError as e:
+                rows = None
+                self.log_test("Get Transactions as NDJSON", False, f"Invalid JSON line: {e}",
+                              response.content[:512].decode("utf-8", "replace"))
+            if rows is not None:
+                if content_type.startswith("application/x-ndjson") and len(rows) == len(transactions):
+                    self.log_test("Get Transactions as NDJSON", True, f"{len(rows)} lines, matching /transactions")
+                else:
+                    self.log_test("Get Transactions as NDJSON", False,
+                                 f"Content-Type: {content_type}, {len(rows)} lines vs {len(transactions)} transactions")
         
         # Test POST /api/transactions (add new transaction)
         new_transaction = {
@@ -160,82 +222,110 @@ class FinanceTrackerTester:
         }
         
         response = self.make_request("POST", "/transactions", new_transaction)
-        if isinstance(response, tuple):
-            self.log_test("Add Transaction", False, f"Request failed: {response[1]}")
+        data = self.get_json("Add Transaction", response)
+        if data is None:
             return False
         
-        if response.status_code == 200:
-            data = response.json()
-            if data.get("success") and "transaction" in data and "id" in data["transaction"]:
-                self.created_transaction_id = data["transaction"]["id"]
-                anomaly = data.get("anomaly")
-                ds_info = data.get("dsInfo", "")
-                self.log_test("Add Transaction", True, 
-                             f"Created transaction ID: {self.created_transaction_id}. Anomaly: {anomaly is not None}. DSA: {ds_info}")
-            else:
-                self.log_test("Add Transaction", False, "Invalid response structure", data)
-                return False
+        if data.get("success") and "transaction" in data and "id" in data["transaction"]:
+            self.created_transaction_id = data["transaction"]["id"]
+            anomaly = data.get("anomaly")
+            ds_info = data.get("dsInfo", "")
+            self.log_test("Add Transaction", True, 
+                         f"Created transaction ID: {self.created_transaction_id}. Anomaly: {anomaly is not None}. DSA: {ds_info}")
         else:
-            self.log_test("Add Transaction", False, f"HTTP {response.status_code}", response.text)
+            self.log_test("Add Transaction", False, "Invalid response structure", data)
             return False
         
+        # The reads below depend on the POST above but not on each other
+        start_date = "2025-01-01"
+        end_date = "2025-12-31"
+        recent, in_range, by_id = self.make_requests_parallel([
+            ("GET", "/transactions/recent", None, {"count": 5}),
+            ("GET", "/transactions/range", None, {"start_date": start_date, "end_date": end_date}),
+            ("GET", f"/transactions/{self.created_transaction_id}", None, None),
+        ])
+        
         # Test GET /api/transactions/recent?count=5
-        response = self.make_request("GET", "/transactions/recent", params={"count": 5})
-        if isinstance(response, tuple):
-            self.log_test("Get Recent Transactions", False, f"Request failed: {response[1]}")
-        elif response.status_code == 200:
-            data = response.json()
-            recent = data.get("transactions", [])
+        data = self.get_json("Get Recent Transactions", recent)
+        if data is not None:
+            recent_transactions = data.get("transactions", [])
             ds_info = data.get("dsInfo", "")
-            self.log_test("Get Recent Transactions", True, f"Found {len(recent)} recent transactions. DSA: {ds_info}")
-        else:
-            self.log_test("Get Recent Transactions", False, f"HTTP {response.status_code}", response.text)
+            self.log_test("Get Recent Transactions", True, f"Found {len(recent_transactions)} recent transactions. DSA: {ds_info}")
         
         # Test GET /api/transactions/range?start_date=2025-01-01&end_date=2025-12-31
-        start_date = "2025-01-01"
-        end_date = "2025-12-31"
-        response = self.make_request("GET", "/transactions/range", 
-                                   params={"start_date": start_date, "end_date": end_date})
-        if isinstance(response, tuple):
-            self.log_test("Get Transactions by Range", False, f"Request failed: {response[1]}")
-        elif response.status_code == 200:
-            data = response.json()
+        data = self.get_json("Get Transactions by Range", in_range)
+        if data is not None:
             range_transactions = data.get("transactions", [])
             ds_info = data.get("dsInfo", "")
             self.log_test("Get Transactions by Range", True, 
                          f"Found {len(range_transactions)} transactions in range {start_date} to {end_date}. DSA: {ds_info}")
-        else:
-            self.log_test("Get Transactions by Range", False, f"HTTP {response.status_code}", response.text)
         
         # Test GET /api/transactions/{transaction_id} (get by ID)
-        if self.created_transaction_id:
-            response = self.make_request("GET", f"/transactions/{self.created_transaction_id}")
-            if isinstance(response, tuple):
-                self.log_test("Get Transaction by ID", False, f"Request failed: {response[1]}")
-            elif response.status_code == 200:
-                data = response.json()
-                transaction = data.get("transaction")
-                ds_info = data.get("dsInfo", "")
-                if transaction and transaction.get("id") == self.created_transaction_id:
-                    self.log_test("Get Transaction by ID", True, f"Retrieved transaction {self.created_transaction_id}. DSA: {ds_info}")
-                else:
-                    self.log_test("Get Transaction by ID", False, "Transaction ID mismatch", data)
+        data = self.get_json("Get Transaction by ID", by_id)
+        if data is not None:
+            transaction = data.get("transaction")
+            ds_info = data.get("dsInfo", "")
+            if transaction and transaction.get("id") == self.created_transaction_id:
+                self.log_test("Get Transaction by ID", True, f"Retrieved transaction {self.created_transaction_id}. DSA: {ds_info}")
             else:
-                self.log_test("Get Transaction by ID", False, f"HTTP {response.status_code}", response.text)
+                self.log_test("Get Transaction by ID", False, "Transaction ID mismatch", data)
         
         # Test DELETE /api/transactions/{transaction_id}
         if self.created_transaction_id:
             response = self.make_request("DELETE", f"/transactions/{self.created_transaction_id}")
-            if isinstance(response, tuple):
-                self.log_test("Delete Transaction", False, f"Request failed: {response[1]}")
-            elif response.status_code == 200:
-                data = response.json()
+            data = self.get_json("Delete Transaction", response)
+            if data is not None:
                 if data.get("success"):
                     self.log_test("Delete Transaction", True, f"Deleted transaction {self.created_transaction_id}")
                 else:
                     self.log_test("Delete Transaction", False, "Delete operation failed", data)
+        
+        return True
+    
+    def test_bulk_transactions_endpoint(self):
+        """Test batch insert and its all-or-nothing rollback"""
+        print("🔍 Testing Bulk Transaction Endpoint...")
+        
+        # Unique descriptions let the rollback check find stray rows
+        marker = f"bulk test {datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+        batch = [
+            {"type": "expense", "amount": 12.75, "category": "Groceries", "description": f"{marker} a", "date": "2025-01-17"},
+            {"type": "income", "amount": 40.00, "category": "Freelance", "description": f"{marker} b", "date": "2025-01-17"},
+        ]
+        
+        # Test POST /api/transactions/bulk
+        response = self.make_request("POST", "/transactions/bulk", batch)
+        data = self.get_json("Bulk Add Transactions", response)
+        if data is not None:
+            added = data.get("transactions", [])
+            if data.get("success") and data.get("count") == len(batch) == len(added) and len(data.get("anomalies", [])) == len(batch):
+                self.log_test("Bulk Add Transactions", True, f"Added {len(added)} transactions in one commit. DSA: {data.get('dsInfo', '')}")
+            else:
+                self.log_test("Bulk Add Transactions", False, "Invalid response structure", data)
+        
+            # Clean up so repeated runs don't accumulate test rows
+            for tx in added:
+                self.make_request("DELETE", f"/transactions/{tx['id']}")
+        
+        # A batch with one row the database rejects must store nothing
+        rejected = [
+            {"type": "expense", "amount": 9.99, "category": "Groceries", "description": f"{marker} rollback", "date": "2025-01-17"},
+            {"type": "refund", "amount": 5.00, "category": "Groceries", "description": f"{marker} rollback", "date": "2025-01-17"},
+        ]
+        response = self.make_request("POST", "/transactions/bulk", rejected)
+        if isinstance(response, tuple):
+            self.log_test("Bulk Add Rollback", False, f"Request failed: {response[1]}")
+            return False
+        
+        data = self.get_json("Bulk Add Rollback", self.make_request("GET", "/transactions"))
+        if data is not None:
+            leaked = [tx for tx in data.get("transactions", []) if tx.get("description") == f"{marker} rollback"]
+            if response.status_code == 400 and not leaked:
+                self.log_test("Bulk Add Rollback", True, "Invalid batch rejected with HTTP 400 and no rows stored")
             else:
-                self.log_test("Delete Transaction", False, f"HTTP {response.status_code}", response.text)
+                self.log_test("Bulk Add Rollback", False,
+                             f"HTTP {response.status_code}, {len(leaked)} rows from the rejected batch were stored",
+                             response.content[:512].decode("utf-8", "replace"))
         
         return True
     
@@ -245,18 +335,13 @@ class FinanceTrackerTester:
         
         # Test GET /api/budgets
         response = self.make_request("GET", "/budgets")
-        if isinstance(response, tuple):
-            self.log_test("Get All Budgets", False, f"Request failed: {response[1]}")
+        data = self.get_json("Get All Budgets", response)
+        if data is None:
             return False
         
-        if response.status_code == 200:
-            data = response.json()
-            budgets = data.get("budgets", [])
-            ds_info = data.get("dsInfo", "")
-            self.log_test("Get All Budgets", True, f"Found {len(budgets)} budgets. DSA: {ds_info}")
-        else:
-            self.log_test("Get All Budgets", False, f"HTTP {response.status_code}", response.text)
-            return False
+        budgets = data.get("budgets", [])
+        ds_info = data.get("dsInfo", "")
+        self.log_test("Get All Budgets", True, f"Found {len(budgets)} budgets. DSA: {ds_info}")
         
         # Test POST /api/budgets (set budget)
         new_budget = {
@@ -265,10 +350,8 @@ class FinanceTrackerTester:
         }
         
         response = self.make_request("POST", "/budgets", new_budget)
-        if isinstance(response, tuple):
-            self.log_test("Set Budget", False, f"Request failed: {response[1]}")
-        elif response.status_code == 200:
-            data = response.json()
+        data = self.get_json("Set Budget", response)
+        if data is not None:
             if data.get("success") and "budget" in data:
                 budget = data["budget"]
                 ds_info = data.get("dsInfo", "")
@@ -276,31 +359,25 @@ class FinanceTrackerTester:
                              f"Set budget for {new_budget['category']}: ${new_budget['limit']}. DSA: {ds_info}")
             else:
                 self.log_test("Set Budget", False, "Invalid response structure", data)
-        else:
-            self.log_test("Set Budget", False, f"HTTP {response.status_code}", response.text)
+        
+        # Both alert routes read the state left by the POST above
+        budget_alerts, shortcut_alerts = self.make_requests_parallel([
+            ("GET", "/budgets/alerts", None, None),
+            ("GET", "/alerts", None, None),
+        ])
         
         # Test GET /api/budgets/alerts
-        response = self.make_request("GET", "/budgets/alerts")
-        if isinstance(response, tuple):
-            self.log_test("Get Budget Alerts", False, f"Request failed: {response[1]}")
-        elif response.status_code == 200:
-            data = response.json()
+        data = self.get_json("Get Budget Alerts", budget_alerts)
+        if data is not None:
             alerts = data.get("alerts", [])
             ds_info = data.get("dsInfo", "")
             self.log_test("Get Budget Alerts", True, f"Found {len(alerts)} budget alerts. DSA: {ds_info}")
-        else:
-            self.log_test("Get Budget Alerts", False, f"HTTP {response.status_code}", response.text)
         
         # Test GET /api/alerts (shortcut route)
-        response = self.make_request("GET", "/alerts")
-        if isinstance(response, tuple):
-            self.log_test("Get Alerts (shortcut)", False, f"Request failed: {response[1]}")
-        elif response.status_code == 200:
-            data = response.json()
+        data = self.get_json("Get Alerts (shortcut)", shortcut_alerts)
+        if data is not None:
             alerts = data.get("alerts", [])
             self.log_test("Get Alerts (shortcut)", True, f"Found {len(alerts)} alerts via shortcut route")
-        else:
-            self.log_test("Get Alerts (shortcut)", False, f"HTTP {response.status_code}", response.text)
         
         return True
     
@@ -310,18 +387,13 @@ class FinanceTrackerTester:
         
         # Test GET /api/bills
         response = self.make_request("GET", "/bills")
-        if isinstance(response, tuple):
-            self.log_test("Get All Bills", False, f"Request failed: {response[1]}")
+        data = self.get_json("Get All Bills", response)
+        if data is None:
             return False
         
-        if response.status_code == 200:
-            data = response.json()
-            bills = data.get("bills", [])
-            ds_info = data.get("dsInfo", "")
-            self.log_test("Get All Bills", True, f"Found {len(bills)} bills. DSA: {ds_info}")
-        else:
-            self.log_test("Get All Bills", False, f"HTTP {response.status_code}", response.text)
-            return False
+        bills = data.get("bills", [])
+        ds_info = data.get("dsInfo", "")
+        self.log_test("Get All Bills", True, f"Found {len(bills)} bills. DSA: {ds_info}")
         
         # Test POST /api/bills (add bill)
         new_bill = {
@@ -332,49 +404,36 @@ class FinanceTrackerTester:
         }
         
         response = self.make_request("POST", "/bills", new_bill)
-        if isinstance(response, tuple):
-            self.log_test("Add Bill", False, f"Request failed: {response[1]}")
+        data = self.get_json("Add Bill", response)
+        if data is None:
             return False
         
-        if response.status_code == 200:
-            data = response.json()
-            if data.get("success") and "bill" in data and "id" in data["bill"]:
-                self.created_bill_id = data["bill"]["id"]
-                self.log_test("Add Bill", True, f"Created bill ID: {self.created_bill_id} - {new_bill['name']}")
-            else:
-                self.log_test("Add Bill", False, "Invalid response structure", data)
-                return False
+        if data.get("success") and "bill" in data and "id" in data["bill"]:
+            self.created_bill_id = data["bill"]["id"]
+            self.log_test("Add Bill", True, f"Created bill ID: {self.created_bill_id} - {new_bill['name']}")
         else:
-            self.log_test("Add Bill", False, f"HTTP {response.status_code}", response.text)
+            self.log_test("Add Bill", False, "Invalid response structure", data)
             return False
         
         # Test POST /api/bills/{bill_id}/pay (mark paid)
         if self.created_bill_id:
             response = self.make_request("POST", f"/bills/{self.created_bill_id}/pay")
-            if isinstance(response, tuple):
-                self.log_test("Pay Bill", False, f"Request failed: {response[1]}")
-            elif response.status_code == 200:
-                data = response.json()
+            data = self.get_json("Pay Bill", response)
+            if data is not None:
                 if data.get("success"):
                     self.log_test("Pay Bill", True, f"Paid bill {self.created_bill_id}")
                 else:
                     self.log_test("Pay Bill", False, "Pay operation failed", data)
-            else:
-                self.log_test("Pay Bill", False, f"HTTP {response.status_code}", response.text)
         
         # Test DELETE /api/bills/{bill_id}
         if self.created_bill_id:
             response = self.make_request("DELETE", f"/bills/{self.created_bill_id}")
-            if isinstance(response, tuple):
-                self.log_test("Delete Bill", False, f"Request failed: {response[1]}")
-            elif response.status_code == 200:
-                data = response.json()
+            data = self.get_json("Delete Bill", response)
+            if data is not None:
                 if data.get("success"):
                     self.log_test("Delete Bill", True, f"Deleted bill {self.created_bill_id}")
                 else:
                     self.log_test("Delete Bill", False, "Delete operation failed", data)
-            else:
-                self.log_test("Delete Bill", False, f"HTTP {response.status_code}", response.text)
         
         return True
     
@@ -382,36 +441,31 @@ class FinanceTrackerTester:
         """Test all analytics endpoints"""
         print("🔍 Testing Analytics Endpoints...")
         
+        # Read-only checks with no ordering between them, so fetch them together
+        top_expenses, top_categories, summary_current, summary_specific = self.make_requests_parallel([
+            ("GET", "/top-expenses", None, {"count": 5}),
+            ("GET", "/top-categories", None, {"count": 5}),
+            ("GET", "/monthly-summary", None, None),
+            ("GET", "/monthly-summary", None, {"month": "2025-07"}),
+        ])
+        
         # Test GET /api/top-expenses?count=5
-        response = self.make_request("GET", "/top-expenses", params={"count": 5})
-        if isinstance(response, tuple):
-            self.log_test("Get Top Expenses", False, f"Request failed: {response[1]}")
-        elif response.status_code == 200:
-            data = response.json()
+        data = self.get_json("Get Top Expenses", top_expenses)
+        if data is not None:
             expenses = data.get("topExpenses", [])
             ds_info = data.get("dsInfo", "")
             self.log_test("Get Top Expenses", True, f"Found {len(expenses)} top expenses. DSA: {ds_info}")
-        else:
-            self.log_test("Get Top Expenses", False, f"HTTP {response.status_code}", response.text)
         
         # Test GET /api/top-categories?count=5
-        response = self.make_request("GET", "/top-categories", params={"count": 5})
-        if isinstance(response, tuple):
-            self.log_test("Get Top Categories", False, f"Request failed: {response[1]}")
-        elif response.status_code == 200:
-            data = response.json()
+        data = self.get_json("Get Top Categories", top_categories)
+        if data is not None:
             categories = data.get("topCategories", [])
             ds_info = data.get("dsInfo", "")
             self.log_test("Get Top Categories", True, f"Found {len(categories)} top categories. DSA: {ds_info}")
-        else:
-            self.log_test("Get Top Categories", False, f"HTTP {response.status_code}", response.text)
         
         # Test GET /api/monthly-summary
-        response = self.make_request("GET", "/monthly-summary")
-        if isinstance(response, tuple):
-            self.log_test("Get Monthly Summary (current)", False, f"Request failed: {response[1]}")
-        elif response.status_code == 200:
-            data = response.json()
+        data = self.get_json("Get Monthly Summary (current)", summary_current)
+        if data is not None:
             summary = data.get("summary")
             ds_info = data.get("dsInfo", "")
             if summary:
@@ -422,15 +476,10 @@ class FinanceTrackerTester:
                              f"Month: {month}, Income: ${income:.2f}, Expenses: ${expenses:.2f}. DSA: {ds_info}")
             else:
                 self.log_test("Get Monthly Summary (current)", False, "No summary data", data)
-        else:
-            self.log_test("Get Monthly Summary (current)", False, f"HTTP {response.status_code}", response.text)
         
         # Test GET /api/monthly-summary?month=2025-07
-        response = self.make_request("GET", "/monthly-summary", params={"month": "2025-07"})
-        if isinstance(response, tuple):
-            self.log_test("Get Monthly Summary (specific)", False, f"Request failed: {response[1]}")
-        elif response.status_code == 200:
-            data = response.json()
+        data = self.get_json("Get Monthly Summary (specific)", summary_specific)
+        if data is not None:
             summary = data.get("summary")
             ds_info = data.get("dsInfo", "")
             if summary:
@@ -438,8 +487,6 @@ class FinanceTrackerTester:
                 self.log_test("Get Monthly Summary (specific)", True, f"Retrieved summary for {month}. DSA: {ds_info}")
             else:
                 self.log_test("Get Monthly Summary (specific)", False, "No summary data for July 2025", data)
-        else:
-            self.log_test("Get Monthly Summary (specific)", False, f"HTTP {response.status_code}", response.text)
         
         return True
     
@@ -447,12 +494,15 @@ class FinanceTrackerTester:
         """Test spending trends (sliding window) endpoints"""
         print("🔍 Testing Spending Trends Endpoints...")
         
+        trend_7, trend_30, trend_14 = self.make_requests_parallel([
+            ("GET", "/trends/7-day", None, None),
+            ("GET", "/trends/30-day", None, None),
+            ("GET", "/trends/14", None, None),
+        ])
+        
         # Test GET /api/trends/7-day
-        response = self.make_request("GET", "/trends/7-day")
-        if isinstance(response, tuple):
-            self.log_test("Get 7-Day Trend", False, f"Request failed: {response[1]}")
-        elif response.status_code == 200:
-            data = response.json()
+        data = self.get_json("Get 7-Day Trend", trend_7)
+        if data is not None:
             trend = data.get("trend")
             ds_info = data.get("dsInfo", "")
             if trend:
@@ -463,15 +513,10 @@ class FinanceTrackerTester:
                              f"Period: {period}, Total: ${total_expenses:.2f}, Avg Daily: ${avg_daily:.2f}. DSA: {ds_info}")
             else:
                 self.log_test("Get 7-Day Trend", False, "No trend data", data)
-        else:
-            self.log_test("Get 7-Day Trend", False, f"HTTP {response.status_code}", response.text)
         
         # Test GET /api/trends/30-day
-        response = self.make_request("GET", "/trends/30-day")
-        if isinstance(response, tuple):
-            self.log_test("Get 30-Day Trend", False, f"Request failed: {response[1]}")
-        elif response.status_code == 200:
-            data = response.json()
+        data = self.get_json("Get 30-Day Trend", trend_30)
+        if data is not None:
             trend = data.get("trend")
             ds_info = data.get("dsInfo", "")
             if trend:
@@ -482,15 +527,10 @@ class FinanceTrackerTester:
                              f"Period: {period}, Total: ${total_expenses:.2f}, Avg Daily: ${avg_daily:.2f}. DSA: {ds_info}")
             else:
                 self.log_test("Get 30-Day Trend", False, "No trend data", data)
-        else:
-            self.log_test("Get 30-Day Trend", False, f"HTTP {response.status_code}", response.text)
         
         # Test GET /api/trends/14 (custom days)
-        response = self.make_request("GET", "/trends/14")
-        if isinstance(response, tuple):
-            self.log_test("Get Custom 14-Day Trend", False, f"Request failed: {response[1]}")
-        elif response.status_code == 200:
-            data = response.json()
+        data = self.get_json("Get Custom 14-Day Trend", trend_14)
+        if data is not None:
             trend = data.get("trend")
             ds_info = data.get("dsInfo", "")
             if trend:
@@ -498,8 +538,6 @@ class FinanceTrackerTester:
                 self.log_test("Get Custom 14-Day Trend", True, f"Period: {period}. DSA: {ds_info}")
             else:
                 self.log_test("Get Custom 14-Day Trend", False, "No trend data", data)
-        else:
-            self.log_test("Get Custom 14-Day Trend", False, f"HTTP {response.status_code}", response.text)
         
         return True
     
@@ -509,25 +547,19 @@ class FinanceTrackerTester:
         
         # Test GET /api/anomalies?threshold=2.0
         response = self.make_request("GET", "/anomalies", params={"threshold": 2.0})
-        if isinstance(response, tuple):
-            self.log_test("Get Anomalies", False, f"Request failed: {response[1]}")
-        elif response.status_code == 200:
-            data = response.json()
+        data = self.get_json("Get Anomalies", response)
+        if data is not None:
             anomalies = data.get("anomalies", [])
             threshold = data.get("threshold", 0)
             ds_info = data.get("dsInfo", "")
             self.log_test("Get Anomalies", True, 
                          f"Found {len(anomalies)} anomalies with threshold {threshold}. DSA: {ds_info}")
-        else:
-            self.log_test("Get Anomalies", False, f"HTTP {response.status_code}", response.text)
         
         # Test POST /api/anomalies/check?category=Food&amount=500&threshold=2.0
         response = self.make_request("POST", "/anomalies/check", 
                                    params={"category": "Food", "amount": 500, "threshold": 2.0})
-        if isinstance(response, tuple):
-            self.log_test("Check Anomaly", False, f"Request failed: {response[1]}")
-        elif response.status_code == 200:
-            data = response.json()
+        data = self.get_json("Check Anomaly", response)
+        if data is not None:
             result = data.get("result")
             ds_info = data.get("dsInfo", "")
             if result:
@@ -539,50 +571,56 @@ class FinanceTrackerTester:
                              f"Category: {category}, Amount: ${amount}, Anomaly: {is_anomaly}, Z-Score: {z_score:.2f}. DSA: {ds_info}")
             else:
                 self.log_test("Check Anomaly", False, "No result data", data)
-        else:
-            self.log_test("Check Anomaly", False, f"HTTP {response.status_code}", response.text)
+        
+        # Concurrent checks on a category that does not exist yet all race to
+        # create it; each must succeed and exactly one category must remain
+        new_category = f"Concurrent Check {datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+        check = ("POST", "/anomalies/check", None, {"category": new_category, "amount": 10, "threshold": 2.0})
+        responses = self.make_requests_parallel([check] * MAX_PARALLEL_REQUESTS)
+        failures = [r[1] if isinstance(r, tuple) else f"HTTP {r.status_code}"
+                    for r in responses if isinstance(r, tuple) or r.status_code != 200]
+        data = self.get_json("Concurrent Anomaly Checks (New Category)", self.make_request("GET", "/categories"))
+        if data is not None:
+            matches = data.get("categories", []).count(new_category)
+            if not failures and matches == 1:
+                self.log_test("Concurrent Anomaly Checks (New Category)", True,
+                             f"{len(responses)} concurrent checks created '{new_category}' once")
+            else:
+                self.log_test("Concurrent Anomaly Checks (New Category)", False,
+                             f"{len(failures)} failed checks, category listed {matches} times", failures[:5])
         
         return True
     def test_autocomplete_endpoints(self):
         """Test autocomplete and category endpoints"""
         print("🔍 Testing Autocomplete Endpoints...")
         
+        suggest_prefix, suggest_all, all_categories = self.make_requests_parallel([
+            ("GET", "/categories/suggest", None, {"prefix": "F"}),
+            ("GET", "/categories/suggest", None, None),
+            ("GET", "/categories", None, None),
+        ])
+        
         # Test GET /api/categories/suggest?prefix=F
-        response = self.make_request("GET", "/categories/suggest", params={"prefix": "F"})
-        if isinstance(response, tuple):
-            self.log_test("Category Autocomplete with Prefix", False, f"Request failed: {response[1]}")
-        elif response.status_code == 200:
-            data = response.json()
+        data = self.get_json("Category Autocomplete with Prefix", suggest_prefix)
+        if data is not None:
             suggestions = data.get("suggestions", [])
             ds_info = data.get("dsInfo", "")
             self.log_test("Category Autocomplete with Prefix", True, 
                          f"Found {len(suggestions)} suggestions for prefix 'F'. DSA: {ds_info}")
-        else:
-            self.log_test("Category Autocomplete with Prefix", False, f"HTTP {response.status_code}", response.text)
         
         # Test GET /api/categories/suggest (no prefix)
-        response = self.make_request("GET", "/categories/suggest")
-        if isinstance(response, tuple):
-            self.log_test("Category Autocomplete (no prefix)", False, f"Request failed: {response[1]}")
-        elif response.status_code == 200:
-            data = response.json()
+        data = self.get_json("Category Autocomplete (no prefix)", suggest_all)
+        if data is not None:
             suggestions = data.get("suggestions", [])
             ds_info = data.get("dsInfo", "")
             self.log_test("Category Autocomplete (no prefix)", True, 
                          f"Found {len(suggestions)} suggestions (all categories). DSA: {ds_info}")
-        else:
-            self.log_test("Category Autocomplete (no prefix)", False, f"HTTP {response.status_code}", response.text)
         
         # Test GET /api/categories
-        response = self.make_request("GET", "/categories")
-        if isinstance(response, tuple):
-            self.log_test("Get All Categories", False, f"Request failed: {response[1]}")
-        elif response.status_code == 200:
-            data = response.json()
+        data = self.get_json("Get All Categories", all_categories)
+        if data is not None:
             categories = data.get("categories", [])
             self.log_test("Get All Categories", True, f"Found {len(categories)} categories")
-        else:
-            self.log_test("Get All Categories", False, f"HTTP {response.status_code}", response.text)
         
         return True
     
@@ -591,36 +629,27 @@ class FinanceTrackerTester:
         print("🔍 Testing DSA Info Endpoint...")
         response = self.make_request("GET", "/dsa-info")
         
-        if isinstance(response, tuple):
-            self.log_test("DSA Info", False, f"Request failed: {response[1]}")
+        data = self.get_json("DSA Info", response)
+        if data is None:
             return False
         
-        if response.status_code == 200:
-            data = response.json()
-            data_structures = data.get("dataStructures", [])
-            complexity = data.get("complexity", {})
-            database = data.get("database", {})
+        data_structures = data.get("dataStructures", [])
+        complexity = data.get("complexity", {})
+        database = data.get("database", {})
+        
+        if len(data_structures) >= 7 and complexity and database:
+            # Check for specific data structures
+            ds_names = {ds.get("name", "") for ds in data_structures}
+            found_structures = EXPECTED_DATA_STRUCTURES & ds_names
             
-            if len(data_structures) >= 7 and complexity and database:
-                # Check for specific data structures
-                ds_names = [ds.get("name", "") for ds in data_structures]
-                expected_structures = ["Red-Black Tree", "Skip List", "Indexed Priority Queue", 
-                                     "Polynomial Hash Map", "Sliding Window", "IntroSort", 
-                                     "Z-Score Anomaly Detection"]
-                
-                found_structures = [name for name in expected_structures if name in ds_names]
-                
-                self.log_test("DSA Info", True, 
-                             f"Found {len(data_structures)} data structures ({len(found_structures)}/{len(expected_structures)} expected), "
-                             f"complexity info for {len(complexity)} operations, database: {database.get('type', 'unknown')}")
-                return True
-            else:
-                self.log_test("DSA Info", False, 
-                             f"Incomplete DSA info - structures: {len(data_structures)}, complexity: {len(complexity)}, database: {bool(database)}", 
-                             data)
-                return False
+            self.log_test("DSA Info", True, 
+                         f"Found {len(data_structures)} data structures ({len(found_structures)}/{len(EXPECTED_DATA_STRUCTURES)} expected), "
+                         f"complexity info for {len(complexity)} operations, database: {database.get('type', 'unknown')}")
+            return True
         else:
-            self.log_test("DSA Info", False, f"HTTP {response.status_code}", response.text)
+            self.log_test("DSA Info", False, 
+                         f"Incomplete DSA info - structures: {len(data_structures)}, complexity: {len(complexity)}, database: {bool(database)}", 
+                         data)
             return False
     
     def test_undo_endpoint(self):
@@ -641,7 +670,7 @@ class FinanceTrackerTester:
             self.log_test("Undo Setup", False, "Could not add transaction for undo test")
             return False
         
-        add_data = add_response.json()
+        add_data = json_loads(add_response.content)
         if not add_data.get("success"):
             self.log_test("Undo Setup", False, "Transaction creation failed", add_data)
             return False
@@ -650,10 +679,8 @@ class FinanceTrackerTester:
         
         # Now test POST /api/undo
         response = self.make_request("POST", "/undo")
-        if isinstance(response, tuple):
-            self.log_test("Undo Operation", False, f"Request failed: {response[1]}")
-        elif response.status_code == 200:
-            data = response.json()
+        data = self.get_json("Undo Operation", response)
+        if data is not None:
             success = data.get("success", False)
             can_undo = data.get("canUndo", False)
             ds_info = data.get("dsInfo", "")
@@ -661,22 +688,35 @@ class FinanceTrackerTester:
                 self.log_test("Undo Operation", True, f"Undo successful. Can undo more: {can_undo}. DSA: {ds_info}")
             else:
                 self.log_test("Undo Operation", False, "Undo operation failed", data)
-        else:
-            self.log_test("Undo Operation", False, f"HTTP {response.status_code}", response.text)
         
         return True
     
+    def backend_is_healthy(self):
+        """Quick /health probe with a short read timeout"""
+        try:
+            response = self.session.get(f"{self.base_url}/health", timeout=HEALTH_TIMEOUT)
+            return response.status_code == 200 and json_loads(response.content).get("status") == "healthy"
+        except (requests.exceptions.RequestException, ValueError):
+            return False
+    
     def run_all_tests(self):
         """Run all backend API tests"""
         print("🚀 Starting COMPREHENSIVE Smart Personal Finance Tracker Backend API Tests")
         print(f"🌐 Backend URL: {self.base_url}")
         print("=" * 80)
         
+        # Stop here if the backend is down rather than letting every group
+        # wait out its own timeouts
+        if not self.backend_is_healthy():
+            print("❌ Backend health check failed - skipping remaining tests")
+            return False
+        
         # Test in logical order - all endpoints from the review request
         tests = [
             ("Root & Health", self.test_root_and_health),
             ("Dashboard", self.test_dashboard_endpoint),
             ("Transactions CRUD", self.test_transactions_endpoints),
+            ("Bulk Transactions", self.test_bulk_transactions_endpoint),
             ("Budgets", self.test_budgets_endpoints),
             ("Bills", self.test_bills_endpoints),
             ("Analytics", self.test_analytics_endpoints),
@@ -687,48 +727,34 @@ class FinanceTrackerTester:
             ("DSA Info", self.test_dsa_info_endpoint)
         ]
         
-        total_tests = 0
-        passed_tests = 0
-        failed_tests = []
-        
         for test_group_name, test_func in tests:
             print(f"\n📋 Running {test_group_name} Tests...")
+            # Results accumulate across groups; this group's are the tail
+            group_start = len(self.test_results)
             try:
-                # Clear previous results
-                self.test_results = []
-                
                 # Run the test
                 test_func()
                 
                 # Count results for this group
-                group_total = len(self.test_results)
-                group_passed = sum(1 for result in self.test_results if result["success"])
-                group_failed = group_total - group_passed
-                
-                total_tests += group_total
-                passed_tests += group_passed
-                
-                # Track failed tests
-                for result in self.test_results:
-                    if not result["success"]:
-                        failed_tests.append({
-                            "group": test_group_name,
-                            "test": result["test"],
-                            "details": result["details"],
-                            "response": result.get("response")
-                        })
-                
-                print(f"   {test_group_name}: {group_passed}/{group_total} passed")
+                group_results = self.test_results[group_start:]
+                group_passed = sum(1 for result in group_results if result["success"])
+                print(f"   {test_group_name}: {group_passed}/{len(group_results)} passed")
                 
             except Exception as e:
                 print(f"❌ CRITICAL ERROR in {test_group_name}: {str(e)}")
-                total_tests += 1
-                failed_tests.append({
-                    "group": test_group_name,
+                self.test_results.append({
                     "test": "Critical Error",
+                    "success": False,
                     "details": str(e),
                     "response": None
                 })
+            
+            for result in self.test_results[group_start:]:
+                result["group"] = test_group_name
+        
+        total_tests = len(self.test_results)
+        passed_tests = sum(1 for result in self.test_results if result["success"])
+        failed_tests = [result for result in self.test_results if not result["success"]]
         
         print("\n" + "=" * 80)
         print(f"📊 FINAL RESULTS: {passed_tests}/{total_tests} tests passed")